@@ -0,0 +1,85 @@
+-- Incremental rollups of daily_logs for reporting
+--
+-- daily_log_rollups holds hours and entry counts per day and task, kept up to
+-- date by a trigger on daily_logs, so summaries never rescan the full log
+-- history. Weekly and per-tag views aggregate over the (much smaller) rollup
+-- table. Run after supabase_schema.sql.
+
+CREATE TABLE IF NOT EXISTS daily_log_rollups (
+    log_date DATE NOT NULL,
+    -- task_id when the log is linked to a task, otherwise log_id
+    task_key VARCHAR(255) NOT NULL,
+    hours DECIMAL(10,2) NOT NULL DEFAULT 0,
+    entries INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (log_date, task_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_log_rollups_task_key ON daily_log_rollups(task_key);
+
+-- Add a delta to one rollup row, dropping it once it has no entries left
+CREATE OR REPLACE FUNCTION apply_daily_log_rollup(p_date DATE, p_key VARCHAR, p_hours DECIMAL, p_entries INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO daily_log_rollups (log_date, task_key, hours, entries)
+    VALUES (p_date, p_key, p_hours, p_entries)
+    ON CONFLICT (log_date, task_key) DO UPDATE
+        SET hours = daily_log_rollups.hours + EXCLUDED.hours,
+            entries = daily_log_rollups.entries + EXCLUDED.entries;
+
+    DELETE FROM daily_log_rollups
+    WHERE log_date = p_date AND task_key = p_key AND entries <= 0;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION maintain_daily_log_rollups()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_daily_log_rollup(OLD.log_date, COALESCE(OLD.task_id, OLD.log_id), -OLD.actual_hours, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_daily_log_rollup(NEW.log_date, COALESCE(NEW.task_id, NEW.log_id), NEW.actual_hours, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS maintain_daily_log_rollups ON daily_logs;
+CREATE TRIGGER maintain_daily_log_rollups AFTER INSERT OR UPDATE OR DELETE ON daily_logs
+    FOR EACH ROW EXECUTE FUNCTION maintain_daily_log_rollups();
+
+-- Weekly rollups (ISO weeks starting Monday)
+CREATE OR REPLACE VIEW weekly_log_rollups AS
+SELECT
+    date_trunc('week', log_date)::date AS week_start,
+    task_key,
+    SUM(hours) AS hours,
+    SUM(entries) AS entries
+FROM daily_log_rollups
+GROUP BY 1, 2;
+
+-- Daily hours per task tag; logs without a tagged task count as 'untagged'
+CREATE OR REPLACE VIEW daily_tag_rollups AS
+SELECT
+    r.log_date,
+    COALESCE(tag, 'untagged') AS tag,
+    SUM(r.hours) AS hours
+FROM daily_log_rollups r
+LEFT JOIN tasks t ON t.id = r.task_key
+LEFT JOIN LATERAL unnest(t.tags) AS tag ON TRUE
+GROUP BY 1, 2;
+
+-- Backfill from existing logs (safe to re-run)
+INSERT INTO daily_log_rollups (log_date, task_key, hours, entries)
+SELECT log_date, COALESCE(task_id, log_id), SUM(actual_hours), COUNT(*)
+FROM daily_logs
+GROUP BY 1, 2
+ON CONFLICT (log_date, task_key) DO UPDATE
+    SET hours = EXCLUDED.hours,
+        entries = EXCLUDED.entries;
+
+-- Row Level Security, matching daily_logs
+ALTER TABLE daily_log_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable all operations for authenticated users" ON daily_log_rollups
+    FOR ALL USING (auth.role() = 'authenticated');
@@ -22,6 +22,10 @@ from .planner_task_details import (
 # Import brainstorming functionality
 from .task_brainstorm import BrainstormManager
 
+# Columnar task view for vectorized scoring
+from .task_snapshot import load_task_snapshot
+from src.storage.log_rollups import LogRollups, load_log_rollups, apply_log_changes
+
 
 @dataclass
 class PlannerInput:
@@ -299,25 +303,32 @@ def generate_focus_list(meeting_notes: List[Dict[str, Any]], tasks: List[Dict[st
     return result
 
 
-def _get_yesterday_summary(logs: Dict[str, Any], target_date: datetime.date, meetings: List[Dict[str, Any]] = None) -> str:
+def _get_yesterday_summary(logs: Dict[str, Any], target_date: datetime.date, meetings: List[Dict[str, Any]] = None,
+                           rollups: Optional[LogRollups] = None) -> str:
     # Find the latest entry in logs (most recent working day)
     latest_date = None
     latest_entries = []
     
-    # Sort dates in descending order to find the most recent
-    available_dates = []
-    for date_str in logs.keys():
-        try:
-            date_obj = datetime.fromisoformat(str(date_str)).date()
-            # Only consider dates before the target date
-            if date_obj < target_date:
-                available_dates.append(date_obj)
-        except (ValueError, TypeError):
-            continue
+    if rollups is not None:
+        # Sorted day index: a bisect instead of a scan over every logged day
+        latest_date = rollups.latest_date_before(target_date)
+    else:
+        # Sort dates in descending order to find the most recent
+        available_dates = []
+        for date_str in logs.keys():
+            try:
+                date_obj = datetime.fromisoformat(str(date_str)).date()
+                # Only consider dates before the target date
+                if date_obj < target_date:
+                    available_dates.append(date_obj)
+            except (ValueError, TypeError):
+                continue
+        
+        if available_dates:
+            # Get the most recent date before target_date
+            latest_date = max(available_dates)
     
-    if available_dates:
-        # Get the most recent date before target_date
-        latest_date = max(available_dates)
+    if latest_date:
         latest_entries = logs.get(latest_date.isoformat(), []) or []
     
     # If no entries found, fall back to "yesterday" for the header
@@ -1027,6 +1038,7 @@ def insert_daily_log(text: str, task_id: str, hours: float, paths: Optional[Dict
         logs[log_date].append(log_entry)
         
         _save_yaml(paths["logs"], logs)
+        apply_log_changes(paths["logs"], logs, added=[(log_date, log_entry)])
         
         return {"success": True, "log": log_entry, "date": log_date}
     
@@ -1155,6 +1167,7 @@ def remove_daily_log(query: str, task_id: Optional[str] = None, paths: Optional[
         if task_id:
             # Remove specific task log
             original_count = len(date_logs)
+            removed = [log for log in date_logs if log.get("log_id") == task_id]
             date_logs = [log for log in date_logs if log.get("log_id") != task_id]
             
             if len(date_logs) == original_count:
@@ -1167,11 +1180,13 @@ def remove_daily_log(query: str, task_id: Optional[str] = None, paths: Optional[
                 del logs[target_date_str]
             
             _save_yaml(paths["logs"], logs)
+            apply_log_changes(paths["logs"], logs, removed=[(target_date_str, log) for log in removed])
             return {"success": True, "message": f"Removed log for task '{task_id}' on {target_date_str}"}
         else:
             # Remove all logs for the date
-            del logs[target_date_str]
+            removed = logs.pop(target_date_str)
             _save_yaml(paths["logs"], logs)
+            apply_log_changes(paths["logs"], logs, removed=[(target_date_str, log) for log in removed])
             return {"success": True, "message": f"Removed all logs for {target_date_str}"}
     
     except Exception as e:
@@ -1530,10 +1545,10 @@ def plan_day(payload: Dict[str, Any]) -> Dict[str, str]:
         return {"error": str(exc)}
 
     try:
-        tasks = _load_yaml(paths["tasks"])
-        logs = _load_yaml(paths["logs"]) or {}
-        if isinstance(logs, dict):
-            logs = {str(k): v for k, v in logs.items()}
+        snapshot = load_task_snapshot(paths["tasks"])
+        tasks = snapshot.tasks
+        rollups = load_log_rollups(paths["logs"])
+        logs = rollups.logs
         meetings = _load_yaml(paths["meets"]) or []
     except Exception as exc:
         return {"error": str(exc)}
@@ -1541,13 +1556,10 @@ def plan_day(payload: Dict[str, Any]) -> Dict[str, str]:
     if not isinstance(tasks, list) or not isinstance(logs, dict) or not isinstance(meetings, list):
         return {"error": "Invalid YAML structure"}
 
-    yesterday_md = _get_yesterday_summary(logs, target_date, meetings)
-    
-    # Filter out completed tasks with any completion status
-    completion_statuses = {"done", "completed", "finished", "complete", "cancelled", "canceled"}
-    pending = [t for t in tasks if t.get("status", "").lower() not in completion_statuses]
+    yesterday_md = _get_yesterday_summary(logs, target_date, meetings, rollups=rollups)
     
-    pending.sort(key=lambda t: _score_task(t, target_date), reverse=True)
+    # Filter out completed tasks and rank the rest by _score_task, vectorized over the snapshot
+    pending = snapshot.ranked_pending(target_date)
     free = _compute_free_intervals(meetings, target_date, work_hours["start"], work_hours["end"])
     plan = _pack_tasks(pending, free)
 
@@ -0,0 +1,271 @@
+"""Rule-based fast path for common planner commands.
+
+Short, formulaic requests such as "spent 3 hours on TASK-12" or
+"mark TASK-4 done" are recognized with precompiled regular expressions and
+turned into the same ``{"action", "data"}`` commands the LLM parser returns,
+so they are handled locally without spending any tokens. Every rule carries a
+confidence; ``PlannerParser`` only trusts a match at or above its threshold
+and falls back to the LLM otherwise.
+
+Dates and times are kept exactly as typed ("tomorrow", "6/11"), matching the
+LLM contract, and are normalized later by ``PlannerParser._postprocess``.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Pattern
+
+from src.agents.planner import _parse_priority
+
+
+# Matches below this confidence are sent to the LLM
+FAST_PATH_CONFIDENCE_THRESHOLD = 0.9
+
+# Task identifiers such as TASK-12, ONBOARDING-1 or numeric ticket ids
+_TASK_ID = r"(?P<task_id>[A-Za-z][A-Za-z0-9_]*-\d+|\d{3,})"
+_HOURS = r"(?P<hours>\d+(?:\.\d+)?)\s*(?:h|hrs?|hours?)"
+_DAY = r"(?P<date>today|tomorrow|yesterday|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d{1,2}/\d{1,2}(?:/\d{4})?|\d{4}-\d{2}-\d{2})"
+
+# Words that usually join several intents; such requests go to the LLM
+_MULTI_INTENT = re.compile(r"\b(?:and|then|also|plus)\b|[;,]", re.IGNORECASE)
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"")
+
+_STATUS_WORDS = {
+    "done": "completed",
+    "complete": "completed",
+    "completed": "completed",
+    "finished": "completed",
+    "in progress": "in_progress",
+    "in-progress": "in_progress",
+    "in_progress": "in_progress",
+    "started": "in_progress",
+    "pending": "pending",
+    "todo": "pending",
+    "blocked": "blocked",
+    "cancelled": "cancelled",
+    "canceled": "cancelled",
+}
+_STATUS = r"(?P<status>" + "|".join(re.escape(word) for word in sorted(_STATUS_WORDS, key=len, reverse=True)) + r")"
+
+
+@dataclass
+class FastPathMatch:
+    """A command recognized without the LLM."""
+    rule: str
+    command: Dict[str, Any]
+    confidence: float
+
+
+@dataclass
+class _Rule:
+    name: str
+    pattern: Pattern[str]
+    build: Callable[[Dict[str, str]], Dict[str, Any]]
+    confidence: float
+    # Free-text rules can swallow a second intent, so they are demoted when one is likely
+    free_text: bool = False
+
+
+def _task_ref(groups: Dict[str, str]) -> str:
+    task_id = groups["task_id"]
+    return task_id if task_id.isdigit() else task_id.upper()
+
+
+def _log_command(groups: Dict[str, str]) -> Dict[str, Any]:
+    hours = float(groups["hours"])
+    data: Dict[str, Any] = {
+        "log_id": _task_ref(groups),
+        "hours": int(hours) if hours.is_integer() else hours,
+    }
+    if groups.get("description"):
+        data["description"] = groups["description"].strip()
+    if groups.get("date"):
+        data["date"] = groups["date"]
+    return {"action": "add_log", "data": data}
+
+
+def _status_command(groups: Dict[str, str]) -> Dict[str, Any]:
+    status = _STATUS_WORDS[groups["status"].lower()]
+    return {"action": "update_task", "data": {"identifier": _task_ref(groups), "updates": {"status": status}}}
+
+
+def _add_task_command(groups: Dict[str, str]) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"title": groups["title"].strip()}
+    rest = groups.get("rest") or ""
+    if rest:
+        data["priority"] = _parse_priority(rest)
+    if groups.get("date"):
+        data["due_date"] = groups["date"]
+    return {"action": "add_task", "data": data}
+
+
+def _compile(pattern: str) -> Pattern[str]:
+    return re.compile(r"^\s*" + pattern + r"\s*[.!?]?\s*$", re.IGNORECASE)
+
+
+_RULES: List[_Rule] = [
+    _Rule(
+        "log_hours",
+        _compile(r"(?:log(?:ged)?|spent|spend|worked)\s+" + _HOURS + r"\s+on\s+(?:task\s+)?" + _TASK_ID
+                 + r"(?:\s+(?:for\s+)?(?P<description>.+?))??(?:\s+" + _DAY + r")?"),
+        _log_command,
+        0.95,
+        free_text=True,
+    ),
+    _Rule(
+        "log_hours_on_task_first",
+        _compile(r"(?:log(?:ged)?\s+)?" + _TASK_ID + r"\s*:\s*" + _HOURS + r"(?:\s+(?P<description>.+?))?"),
+        _log_command,
+        0.9,
+        free_text=True,
+    ),
+    _Rule(
+        "mark_status",
+        _compile(r"(?:mark|set)\s+(?:task\s+)?" + _TASK_ID + r"\s+(?:as\s+|to\s+)?" + _STATUS),
+        _status_command,
+        0.97,
+    ),
+    _Rule(
+        "status_verb",
+        _compile(r"(?P<verb>complete|finish|close|start)\s+(?:task\s+)?" + _TASK_ID),
+        lambda g: _status_command({
+            "task_id": g["task_id"],
+            "status": "started" if g["verb"].lower() == "start" else "done",
+        }),
+        0.95,
+    ),
+    _Rule(
+        "set_priority",
+        _compile(r"(?:set|change|update)\s+(?:task\s+)?" + _TASK_ID
+                 + r"\s+priority\s+(?:to\s+)?(?P<priority>high|medium|low)"),
+        lambda g: {"action": "update_task", "data": {
+            "identifier": _task_ref(g), "updates": {"priority": g["priority"].lower()}}},
+        0.97,
+    ),
+    _Rule(
+        "set_priority_of",
+        _compile(r"(?:set|change|update)\s+(?:the\s+)?priority\s+of\s+(?:task\s+)?" + _TASK_ID
+                 + r"\s+to\s+(?P<priority>high|medium|low)"),
+        lambda g: {"action": "update_task", "data": {
+            "identifier": _task_ref(g), "updates": {"priority": g["priority"].lower()}}},
+        0.97,
+    ),
+    _Rule(
+        "remove_task",
+        _compile(r"(?:remove|delete)\s+task\s+" + _TASK_ID),
+        lambda g: {"action": "remove_task", "data": {"identifier": _task_ref(g)}},
+        0.97,
+    ),
+    _Rule(
+        "add_task_quoted",
+        _compile(r"add\s+(?:a\s+)?(?:new\s+)?task\s+(?P<q>['\"])(?P<title>[^'\"]+)(?P=q)"
+                 r"(?P<rest>\s+(?:with\s+)?(?:high|medium|low)\s+priority)?(?:\s+due\s+" + _DAY + r")?"),
+        _add_task_command,
+        0.92,
+    ),
+    _Rule(
+        "list_tasks",
+        _compile(r"(?:list|show)(?:\s+me)?(?:\s+(?:all|my))*\s+tasks"),
+        lambda g: {"action": "list_tasks", "data": {}},
+        0.98,
+    ),
+    _Rule(
+        "plan_day",
+        _compile(r"plan(?:\s+my)?(?:\s+day)?(?:\s+for)?(?:\s+" + _DAY + r")?"),
+        lambda g: {"action": "plan_day", "data": {"date": g.get("date") or "today"}},
+        0.95,
+    ),
+    _Rule(
+        "list_meetings",
+        _compile(r"(?:(?:list|show|get)(?:\s+me)?(?:\s+my)?\s+meetings|(?:what\s+)?meetings\s+do\s+i\s+have"
+                 r"|do\s+i\s+have\s+(?:any\s+)?meetings|meetings)\s+(?:for\s+|on\s+)?" + _DAY),
+        lambda g: {"action": "list_meetings", "data": {"date": g["date"]}},
+        0.95,
+    ),
+    _Rule(
+        "brainstorm_task",
+        _compile(r"brainstorm\s+(?:for\s+)?task\s+" + _TASK_ID),
+        lambda g: {"action": "brainstorm_task", "data": {"task_id": _task_ref(g)}},
+        0.95,
+    ),
+]
+
+
+class FastPathStats:
+    """Thread-safe counters describing how often the fast path is used."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.total = 0
+        self.fast_path = 0
+        self.low_confidence = 0
+        self.rule_hits: Dict[str, int] = {}
+
+    def record_hit(self, rule: str) -> None:
+        with self._lock:
+            self.total += 1
+            self.fast_path += 1
+            self.rule_hits[rule] = self.rule_hits.get(rule, 0) + 1
+
+    def record_fallback(self, low_confidence: bool = False) -> None:
+        with self._lock:
+            self.total += 1
+            if low_confidence:
+                self.low_confidence += 1
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of parsed requests answered without the LLM."""
+        return self.fast_path / self.total if self.total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": self.total,
+                "fast_path": self.fast_path,
+                "llm_fallback": self.total - self.fast_path,
+                "low_confidence": self.low_confidence,
+                "coverage": round(self.fast_path / self.total, 4) if self.total else 0.0,
+                "rule_hits": dict(self.rule_hits),
+            }
+
+
+FAST_PATH_STATS = FastPathStats()
+
+
+def get_fast_path_stats() -> Dict[str, Any]:
+    """Return fast-path coverage metrics for this process."""
+    return FAST_PATH_STATS.as_dict()
+
+
+def match_command(query: str) -> Optional[FastPathMatch]:
+    """Recognize ``query`` with the local rules.
+
+    Returns:
+        The best match, or None if no rule applies
+    """
+    if not query or len(query) > 300:
+        return None
+
+    unquoted = _QUOTED.sub("''", query)
+    multi_intent = bool(_MULTI_INTENT.search(unquoted))
+
+    best: Optional[FastPathMatch] = None
+    for rule in _RULES:
+        m = rule.pattern.match(query)
+        if not m:
+            continue
+        confidence = rule.confidence
+        if multi_intent:
+            # A fixed-shape rule only matches if the connective sits inside a quoted title;
+            # free-text rules may have absorbed a second command
+            if rule.free_text or not _QUOTED.search(query):
+                confidence = min(confidence, 0.5)
+        if best is None or confidence > best.confidence:
+            groups = {k: v for k, v in m.groupdict().items() if v is not None}
+            best = FastPathMatch(rule=rule.name, command=rule.build(groups), confidence=confidence)
+    return best
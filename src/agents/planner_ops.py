@@ -7,6 +7,7 @@ import os
 import time
 from pathlib import Path
 
+from src.storage.log_rollups import apply_log_changes
 from src.utils.logging import log_info, log_error
 
 
@@ -102,6 +103,10 @@ def find_task(tasks: List[Dict[str, Any]], identifier: str) -> Optional[Dict[str
     return None
 
 
+# Write actions that can be combined into a single batch
+BATCH_ACTIONS = {"add_task", "update_task", "remove_task", "add_meeting", "remove_meeting", "add_log"}
+
+
 class PlannerOperations:
     """Simple CRUD operations for planner data."""
     
@@ -113,6 +118,153 @@ class PlannerOperations:
             'logs': 'data/daily_logs.yaml'
         }
     
+    def _insert_task(self, tasks: List[Dict[str, Any]], data: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a new task to an in-memory task list."""
+        # Check if a task with the same title already exists (prevent duplicates)
+        title = data.get("title", "New task")
+        for existing_task in tasks:
+            if existing_task.get("title", "").lower() == title.lower():
+                log_info(f"Task with title '{title}' already exists, skipping creation")
+                return {"success": False, "error": f"Task with title '{title}' already exists"}
+        
+        # Use custom ID if provided, otherwise generate one
+        custom_id = data.get("id") or data.get("identifier")
+        if custom_id:
+            # Check if the custom ID already exists
+            existing_ids = [task.get("id", "") for task in tasks]
+            if custom_id in existing_ids:
+                return {"success": False, "error": f"Task with ID '{custom_id}' already exists"}
+            task_id = custom_id
+        else:
+            task_id = generate_task_id(tasks)
+        
+        # Create task with defaults
+        task = {
+            "id": task_id,
+            "title": title,
+            "priority": data.get("priority", "medium"),
+            "status": data.get("status", "pending"),
+            "tags": data.get("tags", []),
+            "due_date": data.get("due_date", (datetime.now().date() + timedelta(weeks=1)).isoformat())
+        }
+        
+        # Add optional fields
+        if "estimate_hours" in data:
+            task["estimate_hours"] = data["estimate_hours"]
+        
+        tasks.append(task)
+        return {"success": True, "task": task}
+    
+    def _apply_task_updates(self, tasks: List[Dict[str, Any]], identifier: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply updates to a task in an in-memory task list."""
+        initial_task_count = len(tasks)
+        task = find_task(tasks, identifier)
+        
+        if not task:
+            log_error(f"Task '{identifier}' not found for update")
+            return {"success": False, "error": f"Task '{identifier}' not found"}
+        
+        # Track what changed
+        changes = []
+        
+        # Apply updates
+        for field, value in updates.items():
+            if field == "add_tags":
+                # Add tags to existing
+                existing_tags = task.get("tags", [])
+                task["tags"] = list(set(existing_tags + value))
+                changes.append(f"added tags: {', '.join(value)}")
+            elif field == "remove_tags":
+                # Remove tags
+                existing_tags = task.get("tags", [])
+                task["tags"] = [t for t in existing_tags if t not in value]
+                changes.append(f"removed tags: {', '.join(value)}")
+            else:
+                # Direct update
+                old_value = task.get(field, "not set")
+                task[field] = value
+                changes.append(f"{field}: {old_value} → {value}")
+        
+        # Verify no new tasks were created
+        if len(tasks) != initial_task_count:
+            log_error(f"Task count changed during update! Before: {initial_task_count}, After: {len(tasks)}")
+        
+        return {
+            "success": True,
+            "task": task,
+            "changes": changes,
+            "message": f"Updated task '{task['title']}': {'; '.join(changes)}"
+        }
+    
+    def _delete_task(self, tasks: List[Dict[str, Any]], identifier: str) -> Dict[str, Any]:
+        """Remove a task from an in-memory task list."""
+        task = find_task(tasks, identifier)
+        
+        if not task:
+            return {"success": False, "error": f"Task '{identifier}' not found"}
+        
+        tasks[:] = [t for t in tasks if t != task]
+        return {"success": True, "message": f"Removed task '{task['title']}' ({task['id']})"}
+    
+    def _insert_meeting(self, meetings: List[Dict[str, Any]], data: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a new meeting to an in-memory meeting list."""
+        meeting = {
+            "date": data.get("date", datetime.now().date().isoformat()),
+            "time": data.get("time", "10:00"),
+            "event": data.get("title", data.get("event", "Meeting"))
+        }
+        
+        meetings.append(meeting)
+        return {"success": True, "meeting": meeting}
+    
+    def _delete_meeting(self, meetings: List[Dict[str, Any]], date: str, time: Optional[str] = None,
+                        title: Optional[str] = None) -> Dict[str, Any]:
+        """Remove a single matching meeting from an in-memory meeting list."""
+        # Find matching meetings
+        matches = []
+        for meeting in meetings:
+            if meeting.get("date") == date:
+                if time and meeting.get("time") != time:
+                    continue
+                if title and title.lower() not in meeting.get("event", "").lower():
+                    continue
+                matches.append(meeting)
+        
+        if not matches:
+            return {"success": False, "error": "No matching meetings found"}
+        
+        if len(matches) > 1:
+            return {"success": False, "error": f"Multiple meetings found. Please be more specific."}
+        
+        meetings.remove(matches[0])
+        return {"success": True, "message": f"Removed meeting: {matches[0]['event']}"}
+    
+    def _insert_log(self, logs: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a work log entry to an in-memory logs mapping."""
+        # Get date
+        log_date = data.get("date", datetime.now().date().isoformat())
+        
+        # Create log entry
+        log_entry = {
+            "log_id": data.get("log_id", data.get("task_id", "UNKNOWN")),
+            "description": data.get("description", ""),
+            "actual_hours": data.get("hours", 0)
+        }
+        
+        # Add to logs
+        if log_date not in logs:
+            logs[log_date] = []
+        logs[log_date].append(log_entry)
+        
+        return {"success": True, "log": log_entry, "date": log_date}
+    
+    def _load_logs(self) -> Dict[str, Any]:
+        logs = load_yaml(self.paths['logs']) or {}
+        if not isinstance(logs, dict):
+            raise ValueError("Invalid logs file structure")
+        # Convert date keys to strings
+        return {str(k): v for k, v in logs.items()}
+    
     def add_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Add a new task."""
         try:
@@ -120,43 +272,15 @@ class PlannerOperations:
             if not isinstance(tasks, list):
                 return {"success": False, "error": "Invalid tasks file structure"}
             
-            # Check if a task with the same title already exists (prevent duplicates)
-            title = data.get("title", "New task")
-            for existing_task in tasks:
-                if existing_task.get("title", "").lower() == title.lower():
-                    log_info(f"Task with title '{title}' already exists, skipping creation")
-                    return {"success": False, "error": f"Task with title '{title}' already exists"}
-            
-            # Use custom ID if provided, otherwise generate one
-            custom_id = data.get("id") or data.get("identifier")
-            if custom_id:
-                # Check if the custom ID already exists
-                existing_ids = [task.get("id", "") for task in tasks]
-                if custom_id in existing_ids:
-                    return {"success": False, "error": f"Task with ID '{custom_id}' already exists"}
-                task_id = custom_id
-            else:
-                task_id = generate_task_id(tasks)
-            
-            # Create task with defaults
-            task = {
-                "id": task_id,
-                "title": title,
-                "priority": data.get("priority", "medium"),
-                "status": data.get("status", "pending"),
-                "tags": data.get("tags", []),
-                "due_date": data.get("due_date", (datetime.now().date() + timedelta(weeks=1)).isoformat())
-            }
-            
-            # Add optional fields
-            if "estimate_hours" in data:
-                task["estimate_hours"] = data["estimate_hours"]
+            result = self._insert_task(tasks, data)
+            if not result["success"]:
+                return result
             
-            tasks.append(task)
             save_yaml(self.paths['tasks'], tasks)
             
-            log_info(f"Successfully created task: {task_id} - {title}")
-            return {"success": True, "task": task}
+            task = result["task"]
+            log_info(f"Successfully created task: {task['id']} - {task['title']}")
+            return result
             
         except Exception as e:
             log_error(f"Error adding task: {str(e)}")
@@ -168,48 +292,16 @@ class PlannerOperations:
             log_info(f"Updating task '{identifier}' with updates: {updates}")
             
             tasks = load_yaml(self.paths['tasks']) or []
-            initial_task_count = len(tasks)
-            task = find_task(tasks, identifier)
-            
-            if not task:
-                log_error(f"Task '{identifier}' not found for update")
-                return {"success": False, "error": f"Task '{identifier}' not found"}
-            
-            # Track what changed
-            changes = []
-            
-            # Apply updates
-            for field, value in updates.items():
-                if field == "add_tags":
-                    # Add tags to existing
-                    existing_tags = task.get("tags", [])
-                    task["tags"] = list(set(existing_tags + value))
-                    changes.append(f"added tags: {', '.join(value)}")
-                elif field == "remove_tags":
-                    # Remove tags
-                    existing_tags = task.get("tags", [])
-                    task["tags"] = [t for t in existing_tags if t not in value]
-                    changes.append(f"removed tags: {', '.join(value)}")
-                else:
-                    # Direct update
-                    old_value = task.get(field, "not set")
-                    task[field] = value
-                    changes.append(f"{field}: {old_value} → {value}")
-            
-            # Verify no new tasks were created
-            if len(tasks) != initial_task_count:
-                log_error(f"Task count changed during update! Before: {initial_task_count}, After: {len(tasks)}")
+            result = self._apply_task_updates(tasks, identifier, updates)
+            if not result["success"]:
+                return result
             
             save_yaml(self.paths['tasks'], tasks)
             
-            log_info(f"Successfully updated task '{task['id']}' - {task['title']}: {'; '.join(changes)}")
+            task = result["task"]
+            log_info(f"Successfully updated task '{task['id']}' - {task['title']}: {'; '.join(result['changes'])}")
             
-            return {
-                "success": True,
-                "task": task,
-                "changes": changes,
-                "message": f"Updated task '{task['title']}': {'; '.join(changes)}"
-            }
+            return result
             
         except Exception as e:
             log_error(f"Error updating task: {str(e)}")
@@ -219,15 +311,10 @@ class PlannerOperations:
         """Remove a task."""
         try:
             tasks = load_yaml(self.paths['tasks']) or []
-            task = find_task(tasks, identifier)
-            
-            if not task:
-                return {"success": False, "error": f"Task '{identifier}' not found"}
-            
-            tasks = [t for t in tasks if t != task]
-            save_yaml(self.paths['tasks'], tasks)
-            
-            return {"success": True, "message": f"Removed task '{task['title']}' ({task['id']})"}
+            result = self._delete_task(tasks, identifier)
+            if result["success"]:
+                save_yaml(self.paths['tasks'], tasks)
+            return result
             
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -239,16 +326,10 @@ class PlannerOperations:
             if not isinstance(meetings, list):
                 return {"success": False, "error": "Invalid meetings file structure"}
             
-            meeting = {
-                "date": data.get("date", datetime.now().date().isoformat()),
-                "time": data.get("time", "10:00"),
-                "event": data.get("title", data.get("event", "Meeting"))
-            }
-            
-            meetings.append(meeting)
+            result = self._insert_meeting(meetings, data)
             save_yaml(self.paths['meetings'], meetings)
             
-            return {"success": True, "meeting": meeting}
+            return result
             
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -257,27 +338,10 @@ class PlannerOperations:
         """Remove a meeting."""
         try:
             meetings = load_yaml(self.paths['meetings']) or []
-            
-            # Find matching meetings
-            matches = []
-            for meeting in meetings:
-                if meeting.get("date") == date:
-                    if time and meeting.get("time") != time:
-                        continue
-                    if title and title.lower() not in meeting.get("event", "").lower():
-                        continue
-                    matches.append(meeting)
-            
-            if not matches:
-                return {"success": False, "error": "No matching meetings found"}
-            
-            if len(matches) > 1:
-                return {"success": False, "error": f"Multiple meetings found. Please be more specific."}
-            
-            meetings.remove(matches[0])
-            save_yaml(self.paths['meetings'], meetings)
-            
-            return {"success": True, "message": f"Removed meeting: {matches[0]['event']}"}
+            result = self._delete_meeting(meetings, date, time, title)
+            if result["success"]:
+                save_yaml(self.paths['meetings'], meetings)
+            return result
             
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -292,24 +356,11 @@ class PlannerOperations:
             # Convert date keys to strings
             logs = {str(k): v for k, v in logs.items()}
             
-            # Get date
-            log_date = data.get("date", datetime.now().date().isoformat())
-            
-            # Create log entry
-            log_entry = {
-                "log_id": data.get("log_id", data.get("task_id", "UNKNOWN")),
-                "description": data.get("description", ""),
-                "actual_hours": data.get("hours", 0)
-            }
-            
-            # Add to logs
-            if log_date not in logs:
-                logs[log_date] = []
-            logs[log_date].append(log_entry)
-            
+            result = self._insert_log(logs, data)
             save_yaml(self.paths['logs'], logs)
+            apply_log_changes(self.paths['logs'], logs, added=[(result["date"], result["log"])])
             
-            return {"success": True, "log": log_entry, "date": log_date}
+            return result
             
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -343,4 +394,113 @@ class PlannerOperations:
             
         except Exception as e:
             return {"success": False, "error": str(e)}
-
+    
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply several write operations with one load and one save per file.
+        
+        Operations use the ``{"action": ..., "data": ...}`` shape produced by
+        ``PlannerParser``. The batch is all-or-nothing: every operation is
+        applied in memory first and nothing is written if any of them fails.
+        A log may reference a task added earlier in the same batch through
+        ``task_title``; a log with only a description creates its own task,
+        like ``create_task_and_log``.
+        """
+        try:
+            tasks: Optional[List[Dict[str, Any]]] = None
+            meetings: Optional[List[Dict[str, Any]]] = None
+            logs: Optional[Dict[str, Any]] = None
+            dirty = set()
+            results = []
+            
+            def get_tasks() -> List[Dict[str, Any]]:
+                nonlocal tasks
+                if tasks is None:
+                    tasks = load_yaml(self.paths['tasks']) or []
+                    if not isinstance(tasks, list):
+                        raise ValueError("Invalid tasks file structure")
+                return tasks
+            
+            def get_meetings() -> List[Dict[str, Any]]:
+                nonlocal meetings
+                if meetings is None:
+                    meetings = load_yaml(self.paths['meetings']) or []
+                    if not isinstance(meetings, list):
+                        raise ValueError("Invalid meetings file structure")
+                return meetings
+            
+            def get_logs() -> Dict[str, Any]:
+                nonlocal logs
+                if logs is None:
+                    logs = self._load_logs()
+                return logs
+            
+            for position, operation in enumerate(operations, start=1):
+                action = operation.get("action")
+                data = dict(operation.get("data") or {})
+                
+                if action == "add_task":
+                    result = self._insert_task(get_tasks(), data)
+                    dirty.add('tasks')
+                elif action == "update_task":
+                    result = self._apply_task_updates(get_tasks(), data.get("identifier", ""), data.get("updates", {}))
+                    dirty.add('tasks')
+                elif action == "remove_task":
+                    result = self._delete_task(get_tasks(), data.get("identifier", ""))
+                    dirty.add('tasks')
+                elif action == "add_meeting":
+                    result = self._insert_meeting(get_meetings(), data)
+                    dirty.add('meetings')
+                elif action == "remove_meeting":
+                    result = self._delete_meeting(get_meetings(), data.get("date"), data.get("time"), data.get("title"))
+                    dirty.add('meetings')
+                elif action == "add_log":
+                    result = None
+                    if "task_title" in data and "task_id" not in data and "log_id" not in data:
+                        task = find_task(get_tasks(), data.pop("task_title"))
+                        if not task:
+                            result = {"success": False, "error": f"Task '{operation['data']['task_title']}' not found"}
+                        else:
+                            data["task_id"] = task["id"]
+                    elif "task_id" not in data and "log_id" not in data and "description" in data:
+                        task_result = self._insert_task(get_tasks(), {"title": data["description"]})
+                        dirty.add('tasks')
+                        if not task_result["success"]:
+                            result = task_result
+                        else:
+                            data["task_id"] = task_result["task"]["id"]
+                    if result is None:
+                        result = self._insert_log(get_logs(), data)
+                        dirty.add('logs')
+                else:
+                    result = {"success": False, "error": f"Action '{action}' cannot be batched"}
+                
+                results.append({"action": action, **result})
+                if not result["success"]:
+                    log_error(f"Batch operation {position} ({action}) failed: {result['error']}")
+                    return {
+                        "success": False,
+                        "error": f"Operation {position} ({action}) failed: {result['error']}",
+                        "results": results
+                    }
+            
+            # One write per touched file
+            if 'tasks' in dirty:
+                save_yaml(self.paths['tasks'], tasks)
+            if 'meetings' in dirty:
+                save_yaml(self.paths['meetings'], meetings)
+            if 'logs' in dirty:
+                save_yaml(self.paths['logs'], logs)
+                apply_log_changes(self.paths['logs'], logs, added=[
+                    (r["date"], r["log"]) for r in results if r["action"] == "add_log"
+                ])
+            
+            log_info(f"Applied batch of {len(results)} planner operations")
+            return {
+                "success": True,
+                "results": results,
+                "message": f"Applied {len(results)} operations"
+            }
+            
+        except Exception as e:
+            log_error(f"Error applying batch: {str(e)}")
+            return {"success": False, "error": str(e)}
@@ -1,6 +1,6 @@
 """LLM-based parser for planner commands."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIModel
@@ -8,6 +8,8 @@ import json
 from datetime import datetime, date, timedelta
 import re
 
+from src.agents.planner_fastpath import FAST_PATH_CONFIDENCE_THRESHOLD, FAST_PATH_STATS, match_command
+from src.agents.planner_ops import BATCH_ACTIONS
 from src.utils.logging import log_info, log_error
 
 
@@ -34,6 +36,7 @@ Available actions:
 - find_task: Find tasks by partial title match
 - search_tasks: Search tasks by keyword
 - brainstorm_task: Generate brainstorm for a task using RAG and AI
+- batch: Several write actions in one request (add_task, update_task, remove_task, add_meeting, remove_meeting, add_log)
 
 Date parsing:
 - "today" -> current date
@@ -122,7 +125,15 @@ Output: {"action": "brainstorm_task", "data": {"task_title": "job search"}}
 Input: "improve brainstorm for task ONBOARDING-1"
 Output: {"action": "brainstorm_task", "data": {"task_id": "ONBOARDING-1", "force_regenerate": true}}
 
+Input: "add task 'write report' with high priority and log 2 hours on it"
+Output: {"action": "batch", "data": {"operations": [{"action": "add_task", "data": {"title": "write report", "priority": "high"}}, {"action": "add_log", "data": {"task_title": "write report", "description": "write report", "hours": 2}}]}}
+
+Input: "mark TASK-1 as completed and remove TASK-2"
+Output: {"action": "batch", "data": {"operations": [{"action": "update_task", "data": {"identifier": "TASK-1", "updates": {"status": "completed"}}}, {"action": "remove_task", "data": {"identifier": "TASK-2"}}]}}
+
 Always return valid JSON with "action" and "data" fields.
+Only use "batch" when the request asks for more than one write action; each operation has its own "action" and "data".
+Inside a batch, refer to a task added earlier in the same batch with "task_title".
 For update_task, use "identifier" for task ID or title, and "updates" for changes.
 CRITICAL DATE HANDLING: You MUST preserve the EXACT natural language as given by the user. 
 - If user says "6/11", output "6/11" (NOT "2025-06-11", "2025-06-16", or any ISO format)
@@ -137,13 +148,22 @@ CRITICAL DATE HANDLING: You MUST preserve the EXACT natural language as given by
 class PlannerParser:
     """Parser for converting natural language to structured planner commands."""
     
-    def __init__(self, model: OpenAIModel):
-        """Initialize the parser with an OpenAI model."""
+    def __init__(self, model: OpenAIModel, fast_path: bool = True,
+                 confidence_threshold: float = FAST_PATH_CONFIDENCE_THRESHOLD):
+        """Initialize the parser with an OpenAI model.
+        
+        Args:
+            model: Model used for requests the fast path cannot handle
+            fast_path: Try the local rule-based recognizer before the LLM
+            confidence_threshold: Minimum rule confidence to skip the LLM
+        """
         self.agent = Agent(
             model,
             system_prompt=PARSER_SYSTEM_PROMPT,
             result_type=str
         )
+        self.fast_path = fast_path
+        self.confidence_threshold = confidence_threshold
     
     async def parse(self, query: str) -> Dict[str, Any]:
         """Parse a natural language query into a structured command.
@@ -157,6 +177,17 @@ class PlannerParser:
         try:
             log_info(f"Parsing planner query: {query}")
             
+            # Common commands are recognized locally without an LLM call
+            if self.fast_path:
+                match = match_command(query)
+                if match and match.confidence >= self.confidence_threshold:
+                    FAST_PATH_STATS.record_hit(match.rule)
+                    log_info(f"Fast path parsed query with rule '{match.rule}' (confidence {match.confidence})")
+                    parsed = self._postprocess(match.command, query)
+                    log_info(f"Final parsed result: {parsed}")
+                    return parsed
+                FAST_PATH_STATS.record_fallback(low_confidence=match is not None)
+            
             # Get the LLM to parse the query
             result = await self.agent.run(query)
             parsed_json = result.data
@@ -176,24 +207,7 @@ class PlannerParser:
             # Log the parsed action
             log_info(f"Parsed action: {parsed['action']}")
             
-            # Special handling for update_task to ensure it's not misinterpreted as add_task
-            if parsed["action"] == "add_task" and any(word in query.lower() for word in ["update", "change", "modify", "mark", "set"]):
-                log_error(f"Potential misparse: Query '{query}' parsed as add_task but contains update keywords")
-                # Try to correct it
-                if "identifier" not in parsed["data"] and any(word in query.lower() for word in ["status", "priority", "tag"]):
-                    log_info("Attempting to correct parse to update_task")
-                    # This might be an update request
-                    return {"action": "error", "data": {"message": "Ambiguous request - please specify the task ID or title to update"}}
-            
-            # Fix incorrect date conversions by LLM
-            self._fix_date_conversions(parsed, query)
-            
-            # Post-process dates if present (only for actions that need ISO dates)
-            if parsed["action"] not in ["list_meetings"]:
-                parsed["data"] = self._process_dates(parsed["data"])
-            
-            # Post-process times if present
-            parsed["data"] = self._process_times(parsed["data"])
+            parsed = self._postprocess(parsed, query)
             
             log_info(f"Final parsed result: {parsed}")
             return parsed
@@ -202,6 +216,58 @@ class PlannerParser:
             log_error(f"Error parsing query: {str(e)}")
             return {"action": "error", "data": {"message": str(e)}}
     
+    async def parse_batch(self, query: str) -> List[Dict[str, Any]]:
+        """Parse a query that may contain several intents.
+        
+        Returns:
+            List of 'action'/'data' dicts, one per operation
+        """
+        parsed = await self.parse(query)
+        if parsed["action"] == "batch":
+            return parsed["data"]["operations"]
+        return [parsed]
+    
+    def _postprocess(self, parsed: Dict[str, Any], query: str, in_batch: bool = False) -> Dict[str, Any]:
+        """Validate a parsed command and normalize its dates and times."""
+        if parsed["action"] == "batch":
+            operations = parsed["data"].get("operations")
+            if not isinstance(operations, list) or not operations:
+                log_error(f"Batch without operations: {parsed}")
+                return {"action": "error", "data": {"message": "Invalid response from parser"}}
+            
+            processed = []
+            for operation in operations:
+                if not isinstance(operation, dict) or operation.get("action") not in BATCH_ACTIONS \
+                        or not isinstance(operation.get("data"), dict):
+                    log_error(f"Invalid batch operation: {operation}")
+                    return {"action": "error", "data": {"message": "Invalid operation in multi-step request"}}
+                processed.append(self._postprocess(operation, query, in_batch=True))
+            
+            parsed["data"]["operations"] = processed
+            return parsed
+        
+        # Special handling for update_task to ensure it's not misinterpreted as add_task.
+        # Batches mix adds and updates on purpose, so the check only applies to single commands.
+        if not in_batch and parsed["action"] == "add_task" and any(word in query.lower() for word in ["update", "change", "modify", "mark", "set"]):
+            log_error(f"Potential misparse: Query '{query}' parsed as add_task but contains update keywords")
+            # Try to correct it
+            if "identifier" not in parsed["data"] and any(word in query.lower() for word in ["status", "priority", "tag"]):
+                log_info("Attempting to correct parse to update_task")
+                # This might be an update request
+                return {"action": "error", "data": {"message": "Ambiguous request - please specify the task ID or title to update"}}
+        
+        # Fix incorrect date conversions by LLM
+        self._fix_date_conversions(parsed, query)
+        
+        # Post-process dates if present (only for actions that need ISO dates)
+        if parsed["action"] not in ["list_meetings"]:
+            parsed["data"] = self._process_dates(parsed["data"])
+        
+        # Post-process times if present
+        parsed["data"] = self._process_times(parsed["data"])
+        
+        return parsed
+    
     def _fix_date_conversions(self, parsed: Dict[str, Any], original_query: str) -> None:
         """Fix incorrect date conversions by the LLM."""
         import re
@@ -5,17 +5,27 @@ from pydantic import BaseModel, Field
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.models.openai import OpenAIModel
 import httpx
+import numpy as np
 import re
 import pytz
 import yaml
 import os
 
 from src.agents.base import BaseAgent
+from src.agents.task_snapshot import TaskSnapshot, SEARCH_FIELDS, SEARCH_FIELD_LABELS
+from src.agents.task_index import TaskEmbeddingIndex
 from src.core.constants import AgentType, SYSTEM_PROMPTS
 from src.utils.logging import log_info, log_error
 from src.storage.user_settings import UserSettingsStorage
 
 
+# Task search tuning
+SEMANTIC_SEARCH_TOP_K = 10
+SEMANTIC_SEARCH_MIN_SCORE = 0.3
+LLM_SEARCH_MAX_TASKS = 50
+LLM_RERANK_TOP_K = 20
+
+
 class PrimaryAgentDeps(BaseModel):
     """Dependencies for the primary agent."""
     agents: Dict[str, Any] = Field(default_factory=dict)
@@ -45,6 +55,7 @@ class PrimaryAgent(BaseAgent):
         )
         
         self.agents = agents
+        self._task_index: Optional[TaskEmbeddingIndex] = None
         self._register_tools()
     
     def _get_calendar_url(self, user_id: Optional[str]) -> Optional[str]:
@@ -169,33 +180,33 @@ class PrimaryAgent(BaseAgent):
             """
             log_info(f"Crawling and indexing website: {url}")
             try:
-                from src.processors.crawler import run_crawler
-                from src.storage.chromadb_client import get_chromadb_client
-                from src.storage.collection_manager import CollectionManager
-                
-                # Get ChromaDB client and collection manager
-                chromadb_client = get_chromadb_client()
-                collection_manager = CollectionManager(chromadb_client)
+                from src.processors.crawler import run_crawler, SupabaseCrawlSink
+                from src.storage.supabase_vector import SupabaseVectorClient
                 
-                # Get or create the websites collection
-                try:
-                    websites_collection = chromadb_client.get_collection("automation_agents_websites")
-                except Exception:
-                    # Create collection if it doesn't exist
-                    websites_collection = chromadb_client.create_collection("automation_agents_websites")
+                # Index into the "websites" collection the RAG agent searches; the crawler
+                # computes its own contextual chunks and embeddings
+                vector_client = SupabaseVectorClient(
+                    "websites", enable_contextual=False, user_id=ctx.deps.user_id
+                )
                 
                 # Prepare URLs to crawl
                 urls_to_crawl = [url]
                 
                 # Run the crawler
-                await run_crawler(
+                stats = await run_crawler(
                     urls_to_crawl=urls_to_crawl,
-                    chroma_collection=websites_collection,
                     max_concurrent_crawls=3,
-                    sitemap_url=sitemap_url
+                    sitemap_url=sitemap_url,
+                    sink=SupabaseCrawlSink(vector_client)
                 )
                 
-                return f"Successfully crawled and indexed {url}. Content is now available for search through the RAG agent."
+                if not stats:
+                    return f"No pages were crawled for {url}."
+                return (
+                    f"Successfully crawled and indexed {url}: {stats['pages_crawled']} pages crawled, "
+                    f"{stats['pages_unchanged']} unchanged, {stats['chunks_stored']} chunks stored. "
+                    "Content is now available for search through the RAG agent."
+                )
                 
             except Exception as e:
                 log_error(f"Error crawling website {url}: {str(e)}")
@@ -307,7 +318,7 @@ class PrimaryAgent(BaseAgent):
                 
                 elif action == "add_log":
                     # Check if we need to create a task first
-                    if "task_id" not in data and "description" in data:
+                    if "task_id" not in data and "log_id" not in data and "description" in data:
                         # Create task and log in one operation
                         result = ops.create_task_and_log(
                             data["description"],
@@ -323,10 +334,30 @@ class PrimaryAgent(BaseAgent):
                             return result["message"]
                         else:
                             # Just logged
-                            return f"Work logged: {data.get('hours', 0)} hours on {data.get('task_id', 'task')}"
+                            return f"Work logged: {data.get('hours', 0)} hours on {data.get('task_id', data.get('log_id', 'task'))}"
                     else:
                         return f"Failed to log work: {result['error']}"
-                
+
+                elif action == "batch":
+                    # Several writes in one request: applied together, saved once
+                    result = ops.apply_batch(data["operations"])
+                    if result["success"]:
+                        lines = []
+                        for op_result in result["results"]:
+                            if "message" in op_result:
+                                lines.append(op_result["message"])
+                            elif "task" in op_result:
+                                lines.append(f"Task added: {op_result['task']['title']} (ID: {op_result['task']['id']})")
+                            elif "meeting" in op_result:
+                                meeting = op_result["meeting"]
+                                lines.append(f"Meeting scheduled: {meeting['event']} on {meeting['date']} at {meeting['time']}")
+                            elif "log" in op_result:
+                                log = op_result["log"]
+                                lines.append(f"Work logged: {log['actual_hours']} hours on {log['log_id']}")
+                        return f"{result['message']}:\n" + "\n".join(f"- {line}" for line in lines)
+                    else:
+                        return f"Failed to apply changes (nothing was saved): {result['error']}"
+
                 elif action == "plan_day":
                     # For plan_day, we still use the original function
                     today_date = date.today()
@@ -378,26 +409,27 @@ class PrimaryAgent(BaseAgent):
                 
                 elif action == "find_task" or action == "search_tasks":
                     # Enhanced task search with LLM option
-                    from src.agents.planner_ops import load_yaml
+                    from src.agents.task_snapshot import load_task_snapshot
                     try:
-                        tasks = load_yaml('data/tasks.yaml') or []
+                        snapshot = load_task_snapshot('data/tasks.yaml')
+                        tasks = snapshot.tasks
                         search_query = data.get('title', data.get('query', '')).lower()
                         
                         if not search_query:
                             return "No search query provided."
                         
-                        # Determine if we should use LLM for complex queries
-                        use_llm = self._should_use_llm_search(search_query)
-                        
-                        if use_llm:
-                            # Use LLM for sophisticated search
-                            matches = await self._llm_search_tasks(tasks, search_query)
+                        # Only truly complex queries go to the LLM; fuzzy ones use the local embedding index
+                        if self._should_use_llm_search(search_query):
+                            search_type = "LLM-powered"
+                            matches = await self._llm_search_tasks(tasks, search_query, snapshot)
+                        elif self._should_use_semantic_search(search_query):
+                            search_type = "semantic"
+                            matches = await self._semantic_search_tasks(tasks, search_query, snapshot)
                         else:
-                            # Use traditional keyword search
-                            matches = self._keyword_search_tasks(tasks, search_query)
+                            search_type = "keyword"
+                            matches = self._keyword_search_tasks(tasks, search_query, snapshot)
                         
                         if matches:
-                            search_type = "LLM-powered" if use_llm else "keyword"
                             return f"Tasks matching '{search_query}' ({search_type} search):\n" + "\n".join(matches)
                         else:
                             return f"No tasks found matching '{search_query}'"
@@ -768,75 +800,114 @@ class PrimaryAgent(BaseAgent):
     
     def _should_use_llm_search(self, query: str) -> bool:
         """Determine if we should use LLM for search based on query complexity."""
-        # Use LLM for complex queries that involve:
-        # - Natural language questions
+        # Use LLM only for queries that need reasoning over several tasks:
+        # - Counting and aggregation
         # - Comparisons or conditions
         # - Multiple criteria
-        # - Fuzzy matching needs
         
         llm_indicators = [
-            "how many", "count", "list all", "show me", "find tasks that",
-            "tasks with", "highest", "lowest", "most", "least", "urgent",
-            "overdue", "due soon", "completed", "in progress", "pending",
-            "similar to", "like", "related to", "about", "containing"
+            "how many", "count", "find tasks that", "tasks with",
+            "highest", "lowest", "most", "least", "overdue", "due soon"
         ]
         
         query_lower = query.lower()
         return any(indicator in query_lower for indicator in llm_indicators)
     
-    def _keyword_search_tasks(self, tasks: List[Dict], search_query: str) -> List[str]:
-        """Enhanced keyword search across all task fields."""
-        matches = []
+    def _should_use_semantic_search(self, query: str) -> bool:
+        """Determine if a query needs fuzzy matching rather than exact keywords."""
+        semantic_indicators = [
+            "list all", "show me", "urgent", "similar to", "like",
+            "related to", "about", "regarding", "anything on"
+        ]
         
-        for task in tasks:
-            # Get all searchable fields
-            title = task.get('title', '').lower()
-            description = task.get('description', '').lower()  # If tasks have description
-            priority = task.get('priority', '').lower()
-            status = task.get('status', '').lower()
-            tags = task.get('tags', [])
-            task_id = str(task.get('id', '')).lower()
-            
-            # Check if query matches any field
-            title_match = search_query in title
-            desc_match = search_query in description
-            priority_match = search_query in priority
-            status_match = search_query in status
-            id_match = search_query in task_id
-            tag_match = any(search_query in str(tag).lower() for tag in tags)
-            
-            if any([title_match, desc_match, priority_match, status_match, id_match, tag_match]):
-                # Format the task for display
-                status_display = task.get('status', 'pending')
-                priority_display = task.get('priority', 'medium')
-                task_id_display = task.get('id', 'Unknown')
-                tags_str = f" [tags: {', '.join(str(tag) for tag in tags)}]" if tags else ""
-                
-                match_info = []
-                if title_match:
-                    match_info.append("title")
-                if desc_match:
-                    match_info.append("description")
-                if priority_match:
-                    match_info.append("priority")
-                if status_match:
-                    match_info.append("status")
-                if id_match:
-                    match_info.append("ID")
-                if tag_match:
-                    match_info.append("tags")
-                
-                match_fields = f" (matched: {', '.join(match_info)})" if match_info else ""
-                matches.append(f"- {task_id_display}: {task.get('title', 'Untitled')} ({status_display}, {priority_display} priority){tags_str}{match_fields}")
+        query_lower = query.lower()
+        return any(indicator in query_lower for indicator in semantic_indicators)
+    
+    def _get_task_index(self) -> TaskEmbeddingIndex:
+        """Return the shared task embedding index, creating it on first use."""
+        if self._task_index is None:
+            self._task_index = TaskEmbeddingIndex()
+        return self._task_index
+    
+    @staticmethod
+    def _format_task_match(task: Dict, suffix: str = "") -> str:
+        """Format a matched task as a result line."""
+        status_display = task.get('status', 'pending')
+        priority_display = task.get('priority', 'medium')
+        task_id_display = task.get('id', 'Unknown')
+        tags = task.get('tags', [])
+        tags_str = f" [tags: {', '.join(str(tag) for tag in tags)}]" if tags else ""
+        return f"- {task_id_display}: {task.get('title', 'Untitled')} ({status_display}, {priority_display} priority){tags_str}{suffix}"
+    
+    async def _semantic_candidates(self, tasks: List[Dict], search_query: str,
+                                   snapshot: Optional[TaskSnapshot] = None,
+                                   top_k: int = SEMANTIC_SEARCH_TOP_K,
+                                   min_score: float = 0.0) -> List[tuple]:
+        """Sync the embedding index with ``tasks`` and return its nearest neighbours."""
+        index = self._get_task_index()
+        version = snapshot.version if snapshot is not None and snapshot.tasks is tasks else None
+        await index.sync(tasks, version)
+        return await index.search(search_query, top_k=top_k, min_score=min_score)
+    
+    async def _semantic_search_tasks(self, tasks: List[Dict], search_query: str,
+                                     snapshot: Optional[TaskSnapshot] = None) -> List[str]:
+        """Local k-NN search over task embeddings, with no LLM call."""
+        try:
+            candidates = await self._semantic_candidates(
+                tasks, search_query, snapshot, min_score=SEMANTIC_SEARCH_MIN_SCORE
+            )
+            return [
+                self._format_task_match(tasks[idx], f" (similarity: {score:.2f})")
+                for idx, score in candidates
+            ]
+        except Exception as e:
+            log_error(f"Semantic search failed: {str(e)}, falling back to keyword search")
+            return self._keyword_search_tasks(tasks, search_query, snapshot)
+    
+    def _keyword_search_tasks(self, tasks: List[Dict], search_query: str,
+                              snapshot: Optional[TaskSnapshot] = None) -> List[str]:
+        """Enhanced keyword search across all task fields.
+        
+        Matching runs over the columnar ``TaskSnapshot``; pass the snapshot the
+        tasks were loaded from to avoid rebuilding it.
+        """
+        if snapshot is None or snapshot.tasks is not tasks:
+            snapshot = TaskSnapshot(tasks)
+        
+        field_masks = snapshot.keyword_matches(search_query)
+        any_match = np.logical_or.reduce([field_masks[field] for field in SEARCH_FIELDS])
+        
+        matches = []
+        for idx in np.flatnonzero(any_match):
+            match_info = [SEARCH_FIELD_LABELS[field] for field in SEARCH_FIELDS if field_masks[field][idx]]
+            match_fields = f" (matched: {', '.join(match_info)})" if match_info else ""
+            matches.append(self._format_task_match(tasks[idx], match_fields))
         
         return matches
     
-    async def _llm_search_tasks(self, tasks: List[Dict], search_query: str) -> List[str]:
-        """Use LLM to perform sophisticated task search."""
+    async def _llm_search_tasks(self, tasks: List[Dict], search_query: str,
+                                snapshot: Optional[TaskSnapshot] = None) -> List[str]:
+        """Use LLM to perform sophisticated task search.
+        
+        Small backlogs are sent whole; larger ones are narrowed to the top
+        semantic candidates first so the prompt stays bounded.
+        """
         try:
+            candidate_indices = list(range(len(tasks)))
+            if len(tasks) > LLM_SEARCH_MAX_TASKS:
+                try:
+                    candidates = await self._semantic_candidates(
+                        tasks, search_query, snapshot, top_k=LLM_RERANK_TOP_K
+                    )
+                    candidate_indices = [idx for idx, _ in candidates]
+                except Exception as e:
+                    log_error(f"Semantic prefilter failed: {str(e)}, falling back to keyword search")
+                    return self._keyword_search_tasks(tasks, search_query, snapshot)
+            
             # Prepare task data for LLM
             task_summaries = []
-            for i, task in enumerate(tasks):
+            for i, task_idx in enumerate(candidate_indices):
+                task = tasks[task_idx]
                 summary = f"{i}: {task.get('id', 'Unknown')} - {task.get('title', 'Untitled')} "
                 summary += f"(status: {task.get('status', 'pending')}, priority: {task.get('priority', 'medium')}"
                 
@@ -886,24 +957,17 @@ Task indices:"""
                     indices = [int(x.strip()) for x in indices_text.split(',') if x.strip().isdigit()]
                     
                     for idx in indices:
-                        if 0 <= idx < len(tasks):
-                            task = tasks[idx]
-                            status_display = task.get('status', 'pending')
-                            priority_display = task.get('priority', 'medium')
-                            task_id_display = task.get('id', 'Unknown')
-                            tags = task.get('tags', [])
-                            tags_str = f" [tags: {', '.join(str(tag) for tag in tags)}]" if tags else ""
-                            
-                            matches.append(f"- {task_id_display}: {task.get('title', 'Untitled')} ({status_display}, {priority_display} priority){tags_str}")
+                        if 0 <= idx < len(candidate_indices):
+                            matches.append(self._format_task_match(tasks[candidate_indices[idx]]))
                 
                 except (ValueError, IndexError) as e:
                     # Fall back to keyword search if LLM parsing fails
                     log_error(f"LLM search result parsing failed: {str(e)}, falling back to keyword search")
-                    return self._keyword_search_tasks(tasks, search_query)
+                    return self._keyword_search_tasks(tasks, search_query, snapshot)
             
             return matches
             
         except Exception as e:
             log_error(f"LLM search failed: {str(e)}, falling back to keyword search")
             # Fall back to keyword search if LLM fails
-            return self._keyword_search_tasks(tasks, search_query)
\ No newline at end of file
+            return self._keyword_search_tasks(tasks, search_query, snapshot)
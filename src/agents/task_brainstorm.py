@@ -533,11 +533,17 @@ class BrainstormManager:
     
     def __init__(self, brainstorm_file: str = "task_brainstorms.md",
                  tasks_file: str = "data/tasks.yaml",
-                 task_details_file: str = "data/task_details.yaml"):
-        """Initialize brainstorm manager."""
+                 task_details_file: str = "data/task_details.yaml",
+                 data_dir: str = "data"):
+        """Initialize brainstorm manager.
+        
+        Args:
+            data_dir: Directory for the individual per-task brainstorm files
+        """
         self.brainstorm_file = brainstorm_file
         self.tasks_file = tasks_file
         self.task_details_file = task_details_file
+        self.data_dir = data_dir
     
     async def get_brainstorm(self, query_type: str, query_value: str, 
                             force_regenerate: bool = False) -> Dict[str, Any]:
@@ -560,7 +566,7 @@ class BrainstormManager:
         # Check for existing brainstorm unless forced to regenerate
         if not force_regenerate:
             # First check individual file
-            existing = load_existing_individual_brainstorm(task_id)
+            existing = load_existing_individual_brainstorm(task_id, self.data_dir)
             if existing:
                 return {
                     'success': True,
@@ -598,7 +604,7 @@ class BrainstormManager:
             }
         
         # Save to individual file
-        individual_save_result = save_brainstorm_to_individual_file(brainstorm)
+        individual_save_result = save_brainstorm_to_individual_file(brainstorm, self.data_dir)
         if not individual_save_result['success']:
             log_warning(f"Failed to save individual brainstorm file: {individual_save_result.get('error')}")
         else:
@@ -0,0 +1,199 @@
+"""Local embedding index for semantic task search.
+
+Tasks are embedded with the project's OpenAI embedding model
+(``DEFAULT_EMBEDDING_MODEL``) and kept in an in-memory, L2-normalized NumPy
+matrix so a search is one query embedding plus a local k-NN dot product.
+
+The index is incremental: every task is keyed by a hash of the text it is
+embedded from, so syncing against a changed backlog only embeds new or
+edited tasks. Vectors are persisted to an ``.npz`` file next to the task
+data and reused across restarts.
+"""
+
+import hashlib
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from openai import AsyncOpenAI
+
+from src.core.config import get_settings
+from src.core.constants import DEFAULT_EMBEDDING_MODEL
+from src.utils.logging import log_info, log_error, log_warning
+
+
+EmbedFunction = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+DEFAULT_INDEX_PATH = "data/task_embeddings.npz"
+EMBEDDING_BATCH_SIZE = 256
+QUERY_CACHE_SIZE = 256
+
+
+def task_embedding_text(task: Dict[str, Any]) -> str:
+    """Build the text a task is embedded from."""
+    parts = [str(task.get("title") or "")]
+    if task.get("description"):
+        parts.append(str(task["description"]))
+    if task.get("tags"):
+        parts.append("tags: " + ", ".join(str(tag) for tag in task["tags"]))
+    parts.append(f"status: {task.get('status', 'pending')}")
+    parts.append(f"priority: {task.get('priority', 'medium')}")
+    return "\n".join(parts)
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class TaskEmbeddingIndex:
+    """Incrementally maintained k-NN index over task embeddings."""
+
+    def __init__(
+        self,
+        index_path: Optional[str] = DEFAULT_INDEX_PATH,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        embed_fn: Optional[EmbedFunction] = None,
+    ):
+        """Initialize the index.
+
+        Args:
+            index_path: Where to persist vectors; None keeps the index in memory only
+            model: Embedding model name
+            embed_fn: Optional async embedding function, defaults to the OpenAI API
+        """
+        self.index_path = index_path
+        self.model = model
+        self._embed_fn = embed_fn
+        self._client: Optional[AsyncOpenAI] = None
+
+        self._tasks: List[Dict[str, Any]] = []
+        self._hashes: List[str] = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._version: Optional[Any] = None
+        self._query_cache: Dict[str, np.ndarray] = {}
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batches, returning normalized float32 rows."""
+        if self._embed_fn is None:
+            if self._client is None:
+                settings = get_settings()
+                self._client = AsyncOpenAI(api_key=settings.openai_api_key or settings.llm_api_key)
+            client = self._client
+
+            async def embed_fn(batch: List[str]) -> List[List[float]]:
+                response = await client.embeddings.create(model=self.model, input=batch)
+                return [item.embedding for item in response.data]
+        else:
+            embed_fn = self._embed_fn
+
+        rows: List[List[float]] = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            rows.extend(await embed_fn(texts[start:start + EMBEDDING_BATCH_SIZE]))
+        return _normalize(np.asarray(rows, dtype=np.float32))
+
+    async def sync(self, tasks: List[Dict[str, Any]], version: Optional[Any] = None) -> int:
+        """Align the index with ``tasks``, embedding only new or changed ones.
+
+        Args:
+            tasks: Current task list; index rows follow its order
+            version: Optional data version; syncing the same version again is a no-op
+
+        Returns:
+            Number of tasks that were embedded
+        """
+        if version is not None and version == self._version and tasks is self._tasks:
+            return 0
+
+        texts = [task_embedding_text(task) for task in tasks]
+        hashes = [_text_hash(text) for text in texts]
+        known = {h: row for row, h in enumerate(self._hashes)}
+
+        missing = [i for i, h in enumerate(hashes) if h not in known]
+        new_vectors = await self._embed([texts[i] for i in missing]) if missing else None
+
+        if hashes == self._hashes:
+            matrix = self._matrix
+        elif not hashes:
+            matrix = np.zeros((0, self._matrix.shape[1] if self._matrix.size else 0), dtype=np.float32)
+        else:
+            dim = new_vectors.shape[1] if new_vectors is not None else self._matrix.shape[1]
+            matrix = np.empty((len(hashes), dim), dtype=np.float32)
+            missing_rows = {i: j for j, i in enumerate(missing)}
+            for i, h in enumerate(hashes):
+                if i in missing_rows:
+                    matrix[i] = new_vectors[missing_rows[i]]
+                else:
+                    matrix[i] = self._matrix[known[h]]
+
+        changed = hashes != self._hashes
+        self._tasks = tasks
+        self._hashes = hashes
+        self._matrix = matrix
+        self._version = version
+
+        if changed:
+            log_info(f"Task index synced: {len(hashes)} tasks, {len(missing)} embedded")
+            self._save()
+        return len(missing)
+
+    async def search(self, query: str, top_k: int = 20, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """Return ``(task_index, cosine_similarity)`` pairs for the nearest tasks."""
+        if not query or not self._hashes:
+            return []
+
+        query_vector = self._query_cache.get(query)
+        if query_vector is None:
+            query_vector = (await self._embed([query]))[0]
+            if len(self._query_cache) >= QUERY_CACHE_SIZE:
+                self._query_cache.pop(next(iter(self._query_cache)))
+            self._query_cache[query] = query_vector
+
+        scores = self._matrix @ query_vector
+        k = min(top_k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(i), float(scores[i])) for i in top if scores[i] >= min_score]
+
+    def _load(self) -> None:
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with np.load(self.index_path, allow_pickle=False) as data:
+                if str(data["model"]) != self.model:
+                    log_warning(f"Ignoring task index built with model {data['model']}")
+                    return
+                self._hashes = [str(h) for h in data["hashes"]]
+                self._matrix = data["vectors"].astype(np.float32)
+        except Exception as e:
+            log_error(f"Failed to load task index from {self.index_path}: {str(e)}")
+            self._hashes = []
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def _save(self) -> None:
+        if not self.index_path:
+            return
+        try:
+            directory = os.path.dirname(self.index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.index_path}.tmp.{os.getpid()}.npz"
+            np.savez(
+                temp_path,
+                model=np.array(self.model),
+                hashes=np.array(self._hashes),
+                vectors=self._matrix,
+            )
+            os.replace(temp_path, self.index_path)
+        except Exception as e:
+            log_error(f"Failed to save task index to {self.index_path}: {str(e)}")
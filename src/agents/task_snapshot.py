@@ -0,0 +1,231 @@
+"""Columnar task snapshots for vectorized planner scoring and search.
+
+A ``TaskSnapshot`` turns the list-of-dicts task backlog into NumPy columns
+(priority score, due date ordinal, status code, estimate) plus one
+concatenated, lower-cased haystack per searchable text field. Scoring,
+filtering, sorting and keyword matching then run as array operations
+instead of per-task Python loops, which keeps planning and search
+interactive on large imported backlogs.
+
+Snapshots are built once per data version: ``load_task_snapshot`` keys its
+cache on the YAML file's mtime/size/inode, so repeated calls against an
+unchanged file skip both YAML parsing and column construction.
+"""
+
+import os
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from src.utils.logging import log_info
+
+
+# Mirrors the scoring used by ``planner._score_task``
+PRIORITY_SCORES = {"high": 3, "medium": 2, "low": 1}
+DEFAULT_PRIORITY_SCORE = 1
+NO_DUE_DATE_DAYS = 999
+
+STATUS_CODES = {"pending": 0, "in_progress": 1}
+STATUS_OTHER = 2
+STATUS_DONE = 3
+COMPLETION_STATUSES = {"done", "completed", "finished", "complete", "cancelled", "canceled"}
+
+# Fields searched by keyword, in the order they are reported as matched
+SEARCH_FIELDS = ("title", "description", "priority", "status", "id", "tags")
+SEARCH_FIELD_LABELS = {
+    "title": "title",
+    "description": "description",
+    "priority": "priority",
+    "status": "status",
+    "id": "ID",
+    "tags": "tags",
+}
+
+# Separates rows inside a field haystack; queries never contain it
+_ROW_SEP = "\x00"
+# Separates tags inside a single row so a tag match never spans two tags
+_TAG_SEP = "\x1f"
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _text(value: Any) -> str:
+    """Lower-case a field value for matching, treating None as empty."""
+    if value is None:
+        return ""
+    return str(value).lower().replace(_ROW_SEP, " ")
+
+
+def _priority_score(value: Any) -> int:
+    if isinstance(value, str):
+        return PRIORITY_SCORES.get(value, DEFAULT_PRIORITY_SCORE)
+    return DEFAULT_PRIORITY_SCORE
+
+
+def _due_ordinal(value: Any) -> int:
+    """Return the due date ordinal, or -1 when it cannot be parsed."""
+    try:
+        return datetime.fromisoformat(value).date().toordinal()
+    except Exception:
+        return -1
+
+
+def _status_code(status: str) -> int:
+    if status in COMPLETION_STATUSES:
+        return STATUS_DONE
+    return STATUS_CODES.get(status.replace(" ", "_").replace("-", "_"), STATUS_OTHER)
+
+
+def _estimate(value: Any) -> float:
+    """Normalize an estimate the same way ``planner._pack_tasks`` does."""
+    if value is None or value == "":
+        return 1.0
+    try:
+        hours = int(value)
+    except (ValueError, TypeError):
+        return 1.0
+    return float(hours) if hours > 0 else 1.0
+
+
+class _FieldIndex:
+    """One text column stored as a single haystack with row offsets."""
+
+    __slots__ = ("haystack", "starts")
+
+    def __init__(self, values: List[str]):
+        self.haystack = _ROW_SEP.join(values)
+        lengths = np.fromiter((len(v) + 1 for v in values), dtype=np.int64, count=len(values))
+        self.starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if values else np.zeros(0, np.int64)
+
+    def contains(self, query: str, size: int) -> np.ndarray:
+        """Boolean mask of rows whose text contains ``query``."""
+        mask = np.zeros(size, dtype=bool)
+        if not query or size == 0 or _ROW_SEP in query:
+            return mask
+
+        haystack = self.haystack
+        starts = self.starts
+        pos = haystack.find(query)
+        while pos != -1:
+            row = int(np.searchsorted(starts, pos, side="right")) - 1
+            mask[row] = True
+            # Skip the rest of this row; one hit is enough
+            if row + 1 >= size:
+                break
+            pos = haystack.find(query, int(starts[row + 1]))
+        return mask
+
+
+class TaskSnapshot:
+    """Immutable columnar view over a task list.
+
+    The ``tasks`` list is shared with the snapshot cache and must be treated
+    as read-only by callers.
+    """
+
+    def __init__(self, tasks: List[Dict[str, Any]], version: Optional[Tuple[int, ...]] = None):
+        self.tasks = tasks
+        self.version = version
+        size = len(tasks)
+
+        self.priority = np.fromiter(
+            (_priority_score(t.get("priority", "low")) for t in tasks), dtype=np.int16, count=size
+        )
+        self.due_ordinal = np.fromiter(
+            (_due_ordinal(t.get("due_date")) for t in tasks), dtype=np.int64, count=size
+        )
+        statuses = [_text(t.get("status", "")) for t in tasks]
+        self.status = np.fromiter((_status_code(s) for s in statuses), dtype=np.int8, count=size)
+        self.estimate = np.fromiter(
+            (_estimate(t.get("estimate_hours")) for t in tasks), dtype=np.float64, count=size
+        )
+
+        self._fields = {
+            "title": _FieldIndex([_text(t.get("title", "")) for t in tasks]),
+            "description": _FieldIndex([_text(t.get("description", "")) for t in tasks]),
+            "priority": _FieldIndex([_text(t.get("priority", "")) for t in tasks]),
+            "status": _FieldIndex(statuses),
+            "id": _FieldIndex([_text(t.get("id", "")) for t in tasks]),
+            "tags": _FieldIndex([
+                _TAG_SEP.join(_text(tag) for tag in (t.get("tags") or []))
+                for t in tasks
+            ]),
+        }
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def pending_mask(self) -> np.ndarray:
+        """Rows whose status is not a completion status."""
+        return self.status != STATUS_DONE
+
+    def scores(self, target_date: date) -> np.ndarray:
+        """Vectorized equivalent of ``planner._score_task`` for every row."""
+        days_until_due = np.where(
+            self.due_ordinal >= 0,
+            self.due_ordinal - target_date.toordinal(),
+            NO_DUE_DATE_DAYS,
+        )
+        due_score = np.maximum(0, 7 - days_until_due)
+        return self.priority.astype(np.int64) * 10 + due_score
+
+    def ranked_pending(self, target_date: date) -> List[Dict[str, Any]]:
+        """Pending tasks sorted by descending score, ties in file order."""
+        indices = np.flatnonzero(self.pending_mask())
+        if indices.size == 0:
+            return []
+        scores = self.scores(target_date)[indices]
+        order = indices[np.argsort(-scores, kind="stable")]
+        return [self.tasks[i] for i in order]
+
+    def keyword_matches(self, query: str) -> Dict[str, np.ndarray]:
+        """Per-field boolean masks of rows containing the lower-cased ``query``."""
+        query = query.lower()
+        size = len(self.tasks)
+        return {field: self._fields[field].contains(query, size) for field in SEARCH_FIELDS}
+
+
+_SNAPSHOT_CACHE: Dict[str, TaskSnapshot] = {}
+
+
+def _file_version(path: str) -> Tuple[int, int, int]:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"YAML file not found: {path}")
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def load_task_snapshot(path: str) -> TaskSnapshot:
+    """Load the tasks YAML at ``path`` as a snapshot, reusing it while the file is unchanged.
+
+    An empty file is treated as an empty backlog.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        yaml.YAMLError: If the file is not valid YAML
+        ValueError: If the file does not contain a list of tasks
+    """
+    key = os.path.abspath(path)
+    version = _file_version(path)
+    cached = _SNAPSHOT_CACHE.get(key)
+    if cached is not None and cached.version == version:
+        return cached
+
+    with open(path, "r", encoding="utf-8") as fh:
+        tasks = yaml.load(fh, Loader=_YAML_LOADER)
+    if tasks is None:
+        tasks = []
+    if not isinstance(tasks, list):
+        raise ValueError("Invalid YAML structure")
+
+    snapshot = TaskSnapshot(tasks, version)
+    _SNAPSHOT_CACHE[key] = snapshot
+    log_info(f"Built task snapshot for {path} ({len(tasks)} tasks)")
+    return snapshot
+
+
+def clear_snapshot_cache() -> None:
+    """Drop all cached snapshots."""
+    _SNAPSHOT_CACHE.clear()
@@ -237,6 +237,16 @@ async def health_check():
     return {"status": "ok"}
 
 
+# Planner parser fast-path coverage
+@app.get("/planner/parser-stats")
+async def get_planner_parser_stats():
+    """Get how many planner requests were parsed locally versus by the LLM."""
+    if not AGENTS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Agents not available")
+    from src.agents.planner_fastpath import get_fast_path_stats
+    return get_fast_path_stats()
+
+
 # Tasks endpoints (using Supabase)
 @app.get("/tasks")
 async def get_tasks():
@@ -384,6 +394,27 @@ async def get_logs():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/logs/summary")
+async def get_logs_summary(group_by: str = "task", start: Optional[str] = None, end: Optional[str] = None):
+    """Get logged hours grouped by task, day, week or tag."""
+    if group_by not in ("task", "day", "week", "tag"):
+        raise HTTPException(status_code=400, detail="group_by must be one of task, day, week, tag")
+    result = db_ops.get_hours_summary(group_by, start, end)
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
+@app.get("/logs/burndown")
+async def get_logs_burndown(start: str, end: str, task_ids: Optional[str] = None):
+    """Get remaining estimated hours per day; task_ids is a comma-separated list."""
+    ids = [task_id.strip() for task_id in task_ids.split(",") if task_id.strip()] if task_ids else None
+    result = db_ops.get_burndown(start, end, ids)
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
 @app.post("/logs")
 async def create_log(log_update: LogUpdate):
     """Create a new log entry in Supabase."""
@@ -1,5 +1,16 @@
 """Processing modules for various tasks."""
-from .crawler import run_crawler
+from .crawler import (
+    run_crawler,
+    CrawlPipeline,
+    PipelineConfig,
+    CrawlSink,
+    ChromaCrawlSink,
+    SupabaseCrawlSink,
+    resume_crawl_job
+)
+from .crawl_state import CrawlStateStore, PageState
+from .crawl_jobs import CrawlJobStore, CrawlJob
+from .sitemap import SitemapEntry, URLFrontier, iter_sitemap
 from .image import (
     extract_text_from_image,
     parse_conversation_from_text
@@ -16,6 +27,19 @@ from .calendar import (
 
 __all__ = [
     "run_crawler",
+    "CrawlPipeline",
+    "PipelineConfig",
+    "CrawlSink",
+    "ChromaCrawlSink",
+    "SupabaseCrawlSink",
+    "resume_crawl_job",
+    "CrawlJobStore",
+    "CrawlJob",
+    "CrawlStateStore",
+    "PageState",
+    "SitemapEntry",
+    "URLFrontier",
+    "iter_sitemap",
     "extract_text_from_image",
     "parse_conversation_from_text",
     "parse_calendar_from_text",
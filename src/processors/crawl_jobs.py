@@ -0,0 +1,274 @@
+"""Persistent, resumable crawl jobs.
+
+A crawl job records every URL it has to visit with its status and retry
+count, every chunk it has enriched or stored, and running cost counters.
+All of it lives in the local crawl SQLite database, so a crawl interrupted
+by a restart or deploy can be resumed: finished URLs are not fetched again,
+stored chunks are not re-embedded and already enriched chunks skip the LLM.
+"""
+
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.processors.crawl_state import DEFAULT_STATE_PATH
+from src.utils.logging import log_info
+
+
+# Job statuses
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_INTERRUPTED = "interrupted"
+RESUMABLE_JOB_STATUSES = (JOB_RUNNING, JOB_INTERRUPTED)
+
+# URL statuses
+URL_PENDING = "pending"
+URL_IN_PROGRESS = "in_progress"
+URL_DONE = "done"
+URL_UNCHANGED = "unchanged"
+URL_FAILED = "failed"
+FINISHED_URL_STATUSES = (URL_DONE, URL_UNCHANGED)
+
+COST_COUNTERS = ("llm_calls", "embedding_requests", "embedded_chunks", "estimated_tokens", "chunks_reused")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class CrawlJobStore:
+    """SQLite-backed store of crawl jobs, their URLs and chunks."""
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        """Open (and create if needed) the job tables.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a throwaway store
+        """
+        self.path = path
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        counters = ",\n".join(f"                {name} INTEGER NOT NULL DEFAULT 0" for name in COST_COUNTERS)
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS crawl_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                sink TEXT,
+                sitemap_url TEXT,
+                sitemap_done INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                finished_at TEXT,
+{counters}
+            );
+            CREATE TABLE IF NOT EXISTS crawl_job_urls (
+                job_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority REAL NOT NULL DEFAULT 0.5,
+                lastmod TEXT,
+                retries INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (job_id, url)
+            );
+            CREATE TABLE IF NOT EXISTS crawl_job_chunks (
+                job_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                chunk_hash TEXT NOT NULL,
+                chunk_number INTEGER NOT NULL,
+                title TEXT,
+                summary TEXT,
+                content TEXT,
+                metadata TEXT,
+                doc_id TEXT,
+                PRIMARY KEY (job_id, url, chunk_hash)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def create_job(self, sink: str = "default", sitemap_url: Optional[str] = None,
+                   job_id: Optional[str] = None) -> 'CrawlJob':
+        """Create a new job and return a handle to it."""
+        job_id = job_id or str(uuid.uuid4())
+        now = _now()
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO crawl_jobs (id, status, sink, sitemap_url, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, JOB_RUNNING, sink, sitemap_url, now, now),
+            )
+        log_info(f"Created crawl job {job_id}")
+        return CrawlJob(self, job_id)
+
+    def job(self, job_id: str) -> Optional['CrawlJob']:
+        """Handle to an existing job, or None if it does not exist."""
+        row = self._conn.execute("SELECT id FROM crawl_jobs WHERE id = ?", (job_id,)).fetchone()
+        return CrawlJob(self, job_id) if row else None
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record with URL counts per status, or None if it does not exist."""
+        row = self._conn.execute("SELECT * FROM crawl_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["sitemap_done"] = bool(job["sitemap_done"])
+        job["urls"] = dict(self._conn.execute(
+            "SELECT status, COUNT(*) FROM crawl_job_urls WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+        job["urls"]["total"] = sum(job["urls"].values())
+        job["chunks_stored"] = self._conn.execute(
+            "SELECT COUNT(*) FROM crawl_job_chunks WHERE job_id = ? AND doc_id IS NOT NULL", (job_id,)
+        ).fetchone()[0]
+        return job
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs first."""
+        rows = self._conn.execute(
+            "SELECT id FROM crawl_jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self.get_job(row["id"]) for row in rows]
+
+    def resumable_jobs(self) -> List[Dict[str, Any]]:
+        """Jobs that were interrupted or whose process died while running."""
+        return [job for job in self.list_jobs(limit=-1) if job["status"] in RESUMABLE_JOB_STATUSES]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class CrawlJob:
+    """Handle used by the crawl pipeline to checkpoint one job."""
+
+    def __init__(self, store: CrawlJobStore, job_id: str):
+        self.store = store
+        self.id = job_id
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self.store._conn
+
+    def info(self) -> Dict[str, Any]:
+        return self.store.get_job(self.id)
+
+    def set_status(self, status: str) -> None:
+        finished_at = _now() if status == JOB_COMPLETED else None
+        with self._conn:
+            self._conn.execute(
+                "UPDATE crawl_jobs SET status = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                (status, _now(), finished_at, self.id),
+            )
+
+    def set_sitemap_done(self) -> None:
+        with self._conn:
+            self._conn.execute("UPDATE crawl_jobs SET sitemap_done = 1 WHERE id = ?", (self.id,))
+
+    def add_costs(self, **counters: int) -> None:
+        """Add to the job's cost counters, e.g. ``add_costs(llm_calls=2)``."""
+        names = [name for name in counters if name in COST_COUNTERS]
+        if not names:
+            return
+        assignments = ", ".join(f"{name} = {name} + ?" for name in names)
+        with self._conn:
+            self._conn.execute(
+                f"UPDATE crawl_jobs SET {assignments}, updated_at = ? WHERE id = ?",
+                [counters[name] for name in names] + [_now(), self.id],
+            )
+
+    # URLs
+
+    def add_urls(self, entries: Iterable[Tuple[str, float, Optional[str]]]) -> int:
+        """Record ``(url, priority, lastmod)`` entries; returns how many were new."""
+        now = _now()
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO crawl_job_urls (job_id, url, status, priority, lastmod, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.id, url, URL_PENDING, priority, lastmod, now) for url, priority, lastmod in entries],
+            )
+            return self._conn.total_changes - before
+
+    def urls_to_process(self, max_retries: int) -> List[Tuple[str, float, Optional[str]]]:
+        """URLs not finished yet, including failed ones with retries left."""
+        rows = self._conn.execute(
+            "SELECT url, priority, lastmod FROM crawl_job_urls WHERE job_id = ? "
+            "AND (status IN (?, ?) OR (status = ? AND retries < ?))",
+            (self.id, URL_PENDING, URL_IN_PROGRESS, URL_FAILED, max_retries),
+        ).fetchall()
+        return [(row["url"], row["priority"], row["lastmod"]) for row in rows]
+
+    def url_status(self, url: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT status FROM crawl_job_urls WHERE job_id = ? AND url = ?", (self.id, url)
+        ).fetchone()
+        return row["status"] if row else None
+
+    def url_retries(self, url: str) -> int:
+        row = self._conn.execute(
+            "SELECT retries FROM crawl_job_urls WHERE job_id = ? AND url = ?", (self.id, url)
+        ).fetchone()
+        return row["retries"] if row else 0
+
+    def mark_url(self, url: str, status: str, error: Optional[str] = None) -> None:
+        """Set a URL's status; marking it failed also counts a retry."""
+        retry = 1 if status == URL_FAILED else 0
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO crawl_job_urls (job_id, url, status, retries, last_error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id, url) DO UPDATE SET status = excluded.status, "
+                "retries = crawl_job_urls.retries + ?, last_error = excluded.last_error, "
+                "updated_at = excluded.updated_at",
+                (self.id, url, status, retry, error, _now(), retry),
+            )
+
+    # Chunks
+
+    def record_enriched(self, url: str, chunk_hash: str, chunk_number: int, title: str,
+                        summary: str, content: str, metadata: Dict[str, Any]) -> None:
+        """Checkpoint an enriched chunk so a resumed job does not pay for the LLM calls again."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_job_chunks "
+                "(job_id, url, chunk_hash, chunk_number, title, summary, content, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.id, url, chunk_hash, chunk_number, title, summary, content, json.dumps(metadata)),
+            )
+
+    def enriched_chunk(self, url: str, chunk_hash: str) -> Optional[Dict[str, Any]]:
+        """A previously enriched chunk: chunk_number, title, summary, content and metadata."""
+        row = self._conn.execute(
+            "SELECT chunk_number, title, summary, content, metadata FROM crawl_job_chunks "
+            "WHERE job_id = ? AND url = ? AND chunk_hash = ? AND content IS NOT NULL",
+            (self.id, url, chunk_hash),
+        ).fetchone()
+        if row is None:
+            return None
+        chunk = dict(row)
+        chunk["metadata"] = json.loads(chunk["metadata"] or "{}")
+        return chunk
+
+    def record_stored(self, url: str, chunk_hash: str, doc_id: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "UPDATE crawl_job_chunks SET doc_id = ? WHERE job_id = ? AND url = ? AND chunk_hash = ?",
+                (doc_id, self.id, url, chunk_hash),
+            )
+
+    def stored_chunks(self, url: str) -> Dict[str, str]:
+        """Chunk hash -> document id of the chunks of ``url`` this job already stored."""
+        return dict(self._conn.execute(
+            "SELECT chunk_hash, doc_id FROM crawl_job_chunks WHERE job_id = ? AND url = ? AND doc_id IS NOT NULL",
+            (self.id, url),
+        ).fetchall())
@@ -0,0 +1,145 @@
+"""Persistent crawl state for incremental re-crawls.
+
+For every crawled URL the store keeps the validators the server returned
+(ETag, Last-Modified), a hash of the page's markdown and, per chunk, the
+hash of the raw chunk text together with the document id it was stored
+under. The crawl pipeline uses this to:
+
+- send conditional GETs and skip pages that answer 304 Not Modified
+- skip pages whose rendered content hash has not changed
+- re-enrich and re-embed only the chunks of a changed page that are new,
+  and delete the stored chunks that disappeared
+
+State is kept in a small SQLite database next to the other local data,
+namespaced by crawl destination so the same URL can be indexed into several
+vector stores independently.
+"""
+
+import hashlib
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from src.utils.logging import log_info
+
+
+DEFAULT_STATE_PATH = "data/crawl_state.db"
+
+
+def content_hash(text: str) -> str:
+    """Hash of a page's or chunk's raw text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PageState:
+    """What was stored for a URL on its last successful crawl."""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    crawled_at: Optional[str] = None
+    # Raw chunk hash -> stored document id
+    chunks: Dict[str, str] = field(default_factory=dict)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers for a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CrawlStateStore:
+    """SQLite-backed store of per-URL crawl state."""
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH, namespace: str = "default"):
+        """Open (and create if needed) the state database.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a throwaway store
+            namespace: Crawl destination the state belongs to (see ``CrawlSink.name``)
+        """
+        self.path = path
+        self.namespace = namespace
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_pages (
+                namespace TEXT NOT NULL,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                crawled_at TEXT,
+                PRIMARY KEY (namespace, url)
+            );
+            CREATE TABLE IF NOT EXISTS crawl_page_chunks (
+                namespace TEXT NOT NULL,
+                url TEXT NOT NULL,
+                chunk_hash TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                PRIMARY KEY (namespace, url, chunk_hash)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_page(self, url: str) -> Optional[PageState]:
+        """Return the stored state for ``url``, or None if it was never crawled."""
+        row = self._conn.execute(
+            "SELECT etag, last_modified, content_hash, crawled_at FROM crawl_pages WHERE namespace = ? AND url = ?",
+            (self.namespace, url),
+        ).fetchone()
+        if row is None:
+            return None
+        chunks = dict(self._conn.execute(
+            "SELECT chunk_hash, doc_id FROM crawl_page_chunks WHERE namespace = ? AND url = ?",
+            (self.namespace, url),
+        ).fetchall())
+        return PageState(url, row[0], row[1], row[2], row[3], chunks)
+
+    def save_page(self, state: PageState) -> None:
+        """Replace the stored state for ``state.url``."""
+        crawled_at = state.crawled_at or datetime.now(timezone.utc).isoformat()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_pages (namespace, url, etag, last_modified, content_hash, crawled_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, state.url, state.etag, state.last_modified, state.content_hash, crawled_at),
+            )
+            self._conn.execute(
+                "DELETE FROM crawl_page_chunks WHERE namespace = ? AND url = ?", (self.namespace, state.url)
+            )
+            self._conn.executemany(
+                "INSERT INTO crawl_page_chunks (namespace, url, chunk_hash, doc_id) VALUES (?, ?, ?, ?)",
+                [(self.namespace, state.url, chunk_hash, doc_id) for chunk_hash, doc_id in state.chunks.items()],
+            )
+
+    def update_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Refresh the ETag/Last-Modified of an unchanged page."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE crawl_pages SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), "
+                "crawled_at = ? WHERE namespace = ? AND url = ?",
+                (etag, last_modified, datetime.now(timezone.utc).isoformat(), self.namespace, url),
+            )
+
+    def forget(self, url: str) -> None:
+        """Drop the state for ``url`` so its next crawl starts from scratch."""
+        with self._conn:
+            for table in ("crawl_pages", "crawl_page_chunks"):
+                self._conn.execute(f"DELETE FROM {table} WHERE namespace = ? AND url = ?", (self.namespace, url))
+
+    def close(self) -> None:
+        self._conn.close()
+        log_info(f"Closed crawl state store {self.path}")
@@ -2,21 +2,29 @@ import os
 import sys
 import json
 import asyncio
-import requests
-from xml.etree import ElementTree
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Union
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 import hashlib
+import httpx
 
 from src.utils.logging import log_info, log_warning, log_error
+from src.processors.crawl_state import CrawlStateStore, PageState, content_hash
+from src.processors.crawl_jobs import (
+    CrawlJob, CrawlJobStore, FINISHED_URL_STATUSES, JOB_COMPLETED, JOB_INTERRUPTED, JOB_RUNNING,
+    URL_DONE, URL_FAILED, URL_IN_PROGRESS, URL_UNCHANGED
+)
+from src.processors.sitemap import URLFrontier, feed_frontier_from_sitemap, iter_sitemap, normalize_url
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 from openai import AsyncOpenAI
 import chromadb
 
+if TYPE_CHECKING:
+    from src.storage.supabase_vector import SupabaseVectorClient
+
 load_dotenv("local.env")
 
 # Initialize OpenAI client
@@ -39,25 +47,8 @@ async def add_chunk_to_collection(chunk: 'ProcessedChunk', chroma_collection: ch
         log_warning(f"Skipping chunk {chunk.chunk_number} from {chunk.url} due to missing embedding.")
         return None
 
-    chroma_metadata = {
-        "source_type": "web_page_contextualized",
-        "url": chunk.url,
-        "title": chunk.title or "N/A",
-        "summary": chunk.summary or "N/A",
-        "web_chunk_number": chunk.chunk_number, 
-        "crawled_at": chunk.metadata.get("crawled_at", datetime.now(timezone.utc).isoformat()),
-        "content_length": len(chunk.content),
-        "original_content_length": chunk.metadata.get("original_content_length", 0),
-        "original_url_path": urlparse(chunk.url).path,
-        "source_domain": urlparse(chunk.url).netloc,
-        "context_prefix_length": chunk.metadata.get("context_prefix_length", 0)
-    }
-    for key, value in chunk.metadata.items():
-        if key not in chroma_metadata and isinstance(value, (str, int, float, bool)):
-            chroma_metadata[key] = value
-    
-    content_hash_short = hashlib.md5(chunk.content.encode('utf-8')).hexdigest()[:8]
-    doc_id = f"web_ctx::{chunk.url}::num_{chunk.chunk_number}::hash_{content_hash_short}"
+    chroma_metadata = _chunk_metadata(chunk)
+    doc_id = _chunk_doc_id(chunk)
 
     try:
         chroma_collection.add(
@@ -81,6 +72,140 @@ async def add_chunk_to_collection(chunk: 'ProcessedChunk', chroma_collection: ch
         )
         return None
 
+def _chunk_metadata(chunk: 'ProcessedChunk') -> Dict[str, Any]:
+    chroma_metadata = {
+        "source_type": "web_page_contextualized",
+        "url": chunk.url,
+        "title": chunk.title or "N/A",
+        "summary": chunk.summary or "N/A",
+        "web_chunk_number": chunk.chunk_number, 
+        "crawled_at": chunk.metadata.get("crawled_at", datetime.now(timezone.utc).isoformat()),
+        "content_length": len(chunk.content),
+        "original_content_length": chunk.metadata.get("original_content_length", 0),
+        "original_url_path": urlparse(chunk.url).path,
+        "source_domain": urlparse(chunk.url).netloc,
+        "context_prefix_length": chunk.metadata.get("context_prefix_length", 0)
+    }
+    for key, value in chunk.metadata.items():
+        if key not in chroma_metadata and isinstance(value, (str, int, float, bool)):
+            chroma_metadata[key] = value
+    return chroma_metadata
+
+def _chunk_doc_id(chunk: 'ProcessedChunk') -> str:
+    content_hash_short = hashlib.md5(chunk.content.encode('utf-8')).hexdigest()[:8]
+    return f"web_ctx::{chunk.url}::num_{chunk.chunk_number}::hash_{content_hash_short}"
+
+async def add_chunks_to_collection(chunks: List['ProcessedChunk'], chroma_collection: chromadb.api.models.Collection.Collection) -> List[str]:
+    """Adds several processed chunks to the ChromaDB collection in one write.
+
+    Chunk IDs include a content hash, so re-adding unchanged chunks is an idempotent upsert.
+    """
+    if not chroma_collection:
+        log_error(f"ChromaDB collection not provided. Cannot add {len(chunks)} chunks.")
+        return []
+
+    ids, embeddings, documents, metadatas = [], [], [], []
+    for chunk in chunks:
+        if chunk.embedding is None:
+            log_warning(f"Skipping chunk {chunk.chunk_number} from {chunk.url} due to missing embedding.")
+            continue
+        ids.append(_chunk_doc_id(chunk))
+        embeddings.append(chunk.embedding)
+        documents.append(chunk.content)
+        metadatas.append(_chunk_metadata(chunk))
+    if not ids:
+        return []
+
+    try:
+        chroma_collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+        log_info(f"Added {len(ids)} contextualized chunks to ChromaDB collection '{chroma_collection.name}'.")
+        return ids
+    except Exception as e:
+        log_error(f"Error adding {len(ids)} contextualized chunks to ChromaDB: {e}")
+        return []
+
+class CrawlSink:
+    """Destination for processed crawl chunks.
+
+    Subclass to plug in another vector backend. ``name`` identifies the
+    destination and namespaces the incremental crawl state.
+    """
+    name = "sink"
+
+    async def write(self, chunks: List['ProcessedChunk']) -> List[str]:
+        """Store embedded chunks in one batch; returns the IDs that were written."""
+        raise NotImplementedError
+
+    async def delete(self, ids: List[str]) -> None:
+        """Remove previously stored chunks."""
+        raise NotImplementedError
+
+class ChromaCrawlSink(CrawlSink):
+    """Writes chunks to a ChromaDB collection."""
+
+    def __init__(self, chroma_collection: chromadb.api.models.Collection.Collection):
+        self.collection = chroma_collection
+        self.name = f"chroma:{getattr(chroma_collection, 'name', 'collection')}"
+
+    async def write(self, chunks: List['ProcessedChunk']) -> List[str]:
+        return await add_chunks_to_collection(chunks, self.collection)
+
+    async def delete(self, ids: List[str]) -> None:
+        self.collection.delete(ids=ids)
+
+class SupabaseCrawlSink(CrawlSink):
+    """Writes chunks to Supabase pgvector through a ``SupabaseVectorClient``.
+
+    Rows use the metadata keys the RAG agent reads (source, title, chunk_index,
+    original_content), go to the client's collection and user, and are written
+    with batched upserts off the event loop.
+    """
+
+    def __init__(self, vector_client: 'SupabaseVectorClient', batch_size: int = 500):
+        self.vector_client = vector_client
+        self.batch_size = batch_size
+        self.name = f"supabase:{vector_client.collection_name}:{vector_client.user_id or 'shared'}"
+
+    async def write(self, chunks: List['ProcessedChunk']) -> List[str]:
+        chunks = [chunk for chunk in chunks if chunk.embedding is not None]
+        if not chunks:
+            return []
+        try:
+            ids = await asyncio.to_thread(
+                self.vector_client.upsert_embeddings,
+                [_chunk_doc_id(chunk) for chunk in chunks],
+                [chunk.content for chunk in chunks],
+                [chunk.embedding for chunk in chunks],
+                [_supabase_metadata(chunk) for chunk in chunks],
+                self.batch_size,
+            )
+            log_info(f"Upserted {len(ids)} contextualized chunks to Supabase collection '{self.vector_client.collection_name}'.")
+            return ids
+        except Exception as e:
+            log_error(f"Error upserting {len(chunks)} contextualized chunks to Supabase: {e}")
+            return []
+
+    async def delete(self, ids: List[str]) -> None:
+        await asyncio.to_thread(self.vector_client.delete_documents, ids)
+
+def _supabase_metadata(chunk: 'ProcessedChunk') -> Dict[str, Any]:
+    metadata = _chunk_metadata(chunk)
+    prefix_length = chunk.metadata.get("context_prefix_length", 0)
+    metadata.update({
+        "source": chunk.url,
+        "source_type": "website",
+        "chunk_index": chunk.chunk_number,
+        "original_content": chunk.content[prefix_length + 2:] if prefix_length else chunk.content,
+        "has_context": bool(prefix_length),
+    })
+    return metadata
+
+def as_crawl_sink(target: Any) -> Optional[CrawlSink]:
+    """Wrap a ChromaDB collection as a sink; sinks and None pass through."""
+    if target is None or isinstance(target, CrawlSink):
+        return target
+    return ChromaCrawlSink(target)
+
 @dataclass
 class ProcessedChunk:
     url: str
@@ -220,23 +345,41 @@ async def get_embedding(text: str, model: str = "text-embedding-3-small") -> Lis
         )
         return None
 
-async def process_chunk(original_chunk_content: str, chunk_idx: int, url: str, whole_page_text: str) -> ProcessedChunk | None:
-    # 1. Generate title and summary from the original chunk content
-    # This is done first so it's based on the raw, un-prepended chunk.
-    title_summary = await get_title_and_summary(original_chunk_content, url)
+async def get_embeddings(texts: List[str], model: str = "text-embedding-3-small") -> List[List[float] | None]:
+    """Embed several texts in one API call, returning None for each text on failure."""
+    if not texts:
+        return []
+    if not openai_client:
+        log_error(f"OpenAI client not initialized. Cannot get embeddings for {len(texts)} texts.")
+        return [None] * len(texts)
+    try:
+        response = await openai_client.embeddings.create(
+            model=model,
+            input=texts
+        )
+        embeddings: List[List[float] | None] = [None] * len(texts)
+        for item in response.data:
+            embeddings[item.index] = item.embedding
+        return embeddings
+    except Exception as e:
+        log_error(f"Error getting embeddings for a batch of {len(texts)} texts: {e}")
+        return [None] * len(texts)
 
-    # 2. Generate situating context based on whole page and original chunk
-    context_prefix = await _generate_web_chunk_context(whole_page_text, original_chunk_content, url)
+async def enrich_chunk(original_chunk_content: str, chunk_idx: int, url: str, whole_page_text: str) -> ProcessedChunk:
+    """Add title, summary and situating context to a chunk; the embedding is filled in later."""
+    # Title/summary is based on the raw chunk and is independent of the situating context,
+    # so both LLM calls run concurrently
+    title_summary, context_prefix = await asyncio.gather(
+        get_title_and_summary(original_chunk_content, url),
+        _generate_web_chunk_context(whole_page_text, original_chunk_content, url),
+    )
     
-    # 3. Prepend context to the original chunk content
+    # Prepend context to the original chunk content
     if context_prefix: # Only prepend if context was generated
         contextualized_content = f"{context_prefix}\n\n{original_chunk_content}"
     else:
         contextualized_content = original_chunk_content
     
-    # 4. Get embedding for the contextualized content
-    embedding_vector = await get_embedding(contextualized_content)
-    
     # Base metadata for the chunk
     metadata = {
         "source_domain": urlparse(url).netloc,
@@ -254,74 +397,482 @@ async def process_chunk(original_chunk_content: str, chunk_idx: int, url: str, w
         summary=title_summary['summary'],
         content=contextualized_content, # Storing the contextualized content
         metadata=metadata, 
-        embedding=embedding_vector
+        embedding=None
     )
 
-async def crawl_and_process_url(url: str, web_crawler_instance: AsyncWebCrawler, 
-                                chroma_collection: chromadb.api.models.Collection.Collection):
-    log_info(f"Starting crawl for: {url}")
-    crawl_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS) 
-    result = await web_crawler_instance.arun(url=url, config=crawl_config)
+async def conditional_get(client: httpx.AsyncClient, url: str, headers: Dict[str, str]) -> Tuple[bool, Dict[str, str]]:
+    """Send a conditional GET; returns ``(not_modified, validators)``.
+
+    Errors count as "modified" so the page falls through to a full crawl.
+    """
+    try:
+        async with client.stream("GET", url, headers=headers) as response:
+            # The body is never read; only the status and validators matter
+            return response.status_code == 304, _validators(response.headers)
+    except Exception as e:
+        log_warning(f"Conditional GET failed for {url}, crawling it in full: {e}")
+        return False, {}
+
+def _validators(headers: Any) -> Dict[str, str]:
+    """Pick ETag/Last-Modified out of a response header mapping."""
+    if not headers:
+        return {}
+    lowered = {str(key).lower(): value for key, value in dict(headers).items()}
+    validators = {}
+    if lowered.get("etag"):
+        validators["etag"] = lowered["etag"]
+    if lowered.get("last-modified"):
+        validators["last_modified"] = lowered["last-modified"]
+    return validators
+
+async def process_chunk(original_chunk_content: str, chunk_idx: int, url: str, whole_page_text: str) -> ProcessedChunk | None:
+    chunk = await enrich_chunk(original_chunk_content, chunk_idx, url, whole_page_text)
+    chunk.embedding = await get_embedding(chunk.content)
+    return chunk
+
+
+@dataclass
+class PipelineConfig:
+    """Concurrency and batching limits for the crawl pipeline."""
+    max_concurrent_crawls: int = 3
+    # Politeness: concurrent fetches per domain and seconds between requests to one domain
+    max_concurrent_per_domain: int = 2
+    domain_delay: float = 0.0
+    # Chunks enriched at once; each runs two LLM calls concurrently
+    max_concurrent_enrichments: int = 8
+    embedding_batch_size: int = 64
+    max_concurrent_embeddings: int = 2
+    store_batch_size: int = 100
+    # Bound on items waiting between stages, so a fast stage cannot run far ahead
+    queue_size: int = 200
+    # How long a partial embedding or store batch waits for more items (seconds)
+    batch_wait: float = 0.5
+    # Attempts per URL before a crawl job gives up on it
+    max_retries: int = 2
+
+_STAGE_DONE = object()
+
+def _estimate_tokens(*texts: str) -> int:
+    """Rough token count for cost tracking (~4 characters per token)."""
+    return sum(len(text) for text in texts) // 4
+
+@dataclass
+class _PageProgress:
+    """Chunks of a changed page still in flight, and the state to save once they land."""
+    state: PageState
+    pending: int
+    stale_ids: List[str]
+    failed: bool = False
+
+class CrawlPipeline:
+    """Staged crawl pipeline: fetch -> chunk -> enrich -> embed -> store.
+
+    Stages are connected by bounded asyncio queues and each stage has its own
+    worker count, so page fetches, LLM enrichment, embedding and storage
+    overlap instead of running one chunk at a time. Embeddings and writes are
+    batched.
+
+    With a ``state_store`` the crawl is incremental: pages that answer a
+    conditional GET with 304, or whose content hash is unchanged, are skipped,
+    and of a changed page only new chunks are enriched and embedded. A page's
+    state is saved only after all its new chunks are stored, so an interrupted
+    crawl is redone on the next run.
+
+    With a ``job`` every URL, enriched chunk, stored chunk and cost counter is
+    checkpointed, so a resumed job skips finished URLs, never re-embeds stored
+    chunks and never repeats LLM enrichment.
+    """
+
+    def __init__(self, web_crawler_instance: AsyncWebCrawler,
+                 sink: Union[CrawlSink, chromadb.api.models.Collection.Collection, None],
+                 config: Optional[PipelineConfig] = None,
+                 state_store: Optional[CrawlStateStore] = None,
+                 force: bool = False,
+                 job: Optional[CrawlJob] = None):
+        self.web_crawler = web_crawler_instance
+        # A ChromaDB collection is accepted for backwards compatibility
+        self.sink = as_crawl_sink(sink)
+        self.config = config or PipelineConfig()
+        self.state_store = state_store
+        # Re-process every page, ignoring validators and stored hashes
+        self.force = force
+        self.job = job
+        self._frontier: Optional[URLFrontier] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._pages: Dict[str, _PageProgress] = {}
+        self.stats = {
+            "pages_crawled": 0,
+            "pages_failed": 0,
+            "pages_unchanged": 0,
+            "chunks_reused": 0,
+            "chunks_resumed": 0,
+            "chunks_enriched": 0,
+            "chunks_embedded": 0,
+            "chunks_stored": 0,
+        }
+
+    async def run(self, urls: Union[List[str], URLFrontier]) -> Dict[str, int]:
+        """Crawl ``urls`` through every stage and return per-stage counters.
+
+        ``urls`` may be a list or a ``URLFrontier`` that is still being filled
+        (e.g. from a streaming sitemap); the crawl ends once it is closed and drained.
+        """
+        if isinstance(urls, URLFrontier):
+            frontier = urls
+        else:
+            frontier = self.make_frontier()
+            for url in urls:
+                frontier.add(url)
+            frontier.close()
+        if self.state_store is None or self.force:
+            return await self._run(frontier)
+        async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
+            self._http = client
+            try:
+                return await self._run(frontier)
+            finally:
+                self._http = None
+
+    def make_frontier(self) -> URLFrontier:
+        """A URL frontier using this pipeline's politeness settings."""
+        return URLFrontier(self.config.max_concurrent_per_domain, self.config.domain_delay)
+
+    async def _run(self, frontier: URLFrontier) -> Dict[str, int]:
+        self._frontier = frontier
+        size = self.config.queue_size
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        store_queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+
+        stages = [
+            (self._fetch_worker, frontier, chunk_queue, self.config.max_concurrent_crawls),
+            (self._enrich_worker, chunk_queue, embed_queue, self.config.max_concurrent_enrichments),
+            (self._embed_worker, embed_queue, store_queue, self.config.max_concurrent_embeddings),
+            (self._store_worker, store_queue, None, 1),
+        ]
+
+        running = []
+        for worker, inbox, outbox, count in stages:
+            workers = [asyncio.create_task(worker(inbox, outbox)) for _ in range(max(1, count))]
+            running.append((workers, outbox))
+
+        try:
+            for index, (workers, outbox) in enumerate(running):
+                await asyncio.gather(*workers)
+                if outbox is not None:
+                    # One end marker per worker of the next stage
+                    for _ in running[index + 1][0]:
+                        await outbox.put(_STAGE_DONE)
+        except BaseException:
+            for workers, _ in running:
+                for task in workers:
+                    task.cancel()
+            raise
+
+        log_info(f"Crawl pipeline finished: {self.stats}")
+        return dict(self.stats)
+
+    async def _fetch_worker(self, frontier: URLFrontier, outbox: asyncio.Queue) -> None:
+        while True:
+            url = await frontier.get()
+            if url is None:
+                return
+            try:
+                if self.job:
+                    if self.job.url_status(url) in FINISHED_URL_STATUSES:
+                        continue
+                    self.job.mark_url(url, URL_IN_PROGRESS)
+                await self._fetch(url, outbox)
+            except Exception as e:
+                self._page_failed(url, f"Error crawling {url}: {e}")
+            finally:
+                frontier.done(url)
+
+    def _page_failed(self, url: str, error: str) -> None:
+        """Count a failed page; a job records it and retries it while attempts remain."""
+        self.stats["pages_failed"] += 1
+        log_error(error)
+        if not self.job:
+            return
+        self.job.mark_url(url, URL_FAILED, error)
+        if self.job.url_retries(url) < self.config.max_retries and self._frontier:
+            log_info(f"Retrying {url} later in this crawl.")
+            self._frontier.requeue(url)
+
+    async def _fetch(self, url: str, outbox: asyncio.Queue) -> None:
+        previous = self.state_store.get_page(url) if self.state_store else None
+        validators: Dict[str, str] = {}
+        if previous and self._http and previous.conditional_headers():
+            not_modified, validators = await conditional_get(self._http, url, previous.conditional_headers())
+            if not_modified:
+                self._mark_unchanged(url, validators)
+                return
+
+        log_info(f"Starting crawl for: {url}")
+        crawl_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS) 
+        result = await self.web_crawler.arun(url=url, config=crawl_config)
+
+        if not (result and result.success and result.markdown):
+            self._page_failed(
+                url, f"Failed to crawl or get markdown for: {url}. Error: {result.error_message if result else 'Unknown error during crawl'}"
+            )
+            return
 
-    if result.success and result.markdown:
         # Use the new markdown API which returns a MarkdownGenerationResult
         raw_markdown = result.markdown.raw_markdown
         log_info(f"Successfully crawled: {url}. Raw content length: {len(raw_markdown)}")
+        self.stats["pages_crawled"] += 1
         if not raw_markdown.strip():
             log_warning(f"No actual content found at {url} after crawling. Skipping further processing.")
+            if self.job:
+                self.job.mark_url(url, URL_DONE)
+            return
+
+        validators = _validators(getattr(result, "response_headers", None)) or validators
+        page_hash = content_hash(raw_markdown)
+        if previous and not self.force and previous.content_hash == page_hash:
+            self._mark_unchanged(url, validators)
             return
 
         text_chunks = chunk_text(raw_markdown) # These are chunks of the original raw_markdown
         log_info(f"Split content from {url} into {len(text_chunks)} chunks.")
-        
+        reusable = dict(previous.chunks) if previous and not self.force else {}
+        if self.job:
+            # Chunks this job stored before it was interrupted
+            reusable.update(self.job.stored_chunks(url))
+        state = PageState(url, validators.get("etag"), validators.get("last_modified"), page_hash)
+        new_chunks = []
+        queued = set()
         for i, original_chunk_str in enumerate(text_chunks):
             if not original_chunk_str.strip():
                 log_warning(f"Skipping empty chunk {i} from {url} after chunking.")
                 continue
-            
-            # Pass the full raw_markdown as whole_page_text for context generation
-            processed_chunk_object = await process_chunk(original_chunk_str, i, url, raw_markdown)
-            
-            if processed_chunk_object:
-                if chroma_collection: 
-                    await add_chunk_to_collection(processed_chunk_object, chroma_collection)
-                else:
-                    log_error(f"ChromaDB collection not provided. Cannot store chunk {i} from {url}.")
+            chunk_hash = content_hash(original_chunk_str)
+            if chunk_hash in reusable:
+                # Unchanged chunk: keep the stored document, skip LLM and embedding work
+                state.chunks[chunk_hash] = reusable[chunk_hash]
+                self.stats["chunks_reused"] += 1
+            elif chunk_hash not in state.chunks and chunk_hash not in queued:
+                queued.add(chunk_hash)
+                new_chunks.append((i, original_chunk_str, chunk_hash))
+
+        if self.job and state.chunks:
+            self.job.add_costs(chunks_reused=len(state.chunks))
+        if self.state_store or self.job:
+            kept = set(state.chunks.values())
+            stale_ids = [doc_id for doc_id in (previous.chunks.values() if previous else []) if doc_id not in kept]
+            self._pages[url] = _PageProgress(state, len(new_chunks), stale_ids)
+            if not new_chunks:
+                await self._finish_page(url)
+        log_info(f"{len(new_chunks)} of {len(text_chunks)} chunks from {url} need processing.")
+        for i, original_chunk_str, chunk_hash in new_chunks:
+            # The full raw_markdown is passed along as whole_page_text for context generation
+            await outbox.put((url, i, original_chunk_str, raw_markdown, chunk_hash))
+
+    def _mark_unchanged(self, url: str, validators: Dict[str, str]) -> None:
+        self.stats["pages_unchanged"] += 1
+        self.state_store.update_validators(url, validators.get("etag"), validators.get("last_modified"))
+        if self.job:
+            self.job.mark_url(url, URL_UNCHANGED)
+        log_info(f"Skipping unchanged page: {url}")
+
+    async def _chunk_done(self, url: str, chunk_hash: Optional[str], doc_id: Optional[str]) -> None:
+        """Record the outcome of one new chunk and save the page once all have landed."""
+        if self.job and doc_id and chunk_hash:
+            self.job.record_stored(url, chunk_hash, doc_id)
+        progress = self._pages.get(url)
+        if progress is None:
+            return
+        progress.pending -= 1
+        if doc_id and chunk_hash:
+            progress.state.chunks[chunk_hash] = doc_id
+        else:
+            progress.failed = True
+        if progress.pending <= 0:
+            await self._finish_page(url)
+
+    async def _finish_page(self, url: str) -> None:
+        progress = self._pages.pop(url)
+        if progress.failed:
+            log_warning(f"Some chunks from {url} were not stored; it will be re-processed on the next crawl.")
+            if self.job:
+                self.job.mark_url(url, URL_FAILED, "Some chunks were not stored")
+            return
+        if progress.stale_ids and self.sink:
+            try:
+                await self.sink.delete(progress.stale_ids)
+                log_info(f"Removed {len(progress.stale_ids)} outdated chunks of {url}.")
+            except Exception as e:
+                log_error(f"Error removing outdated chunks of {url}: {e}")
+                if self.job:
+                    self.job.mark_url(url, URL_FAILED, f"Error removing outdated chunks: {e}")
+                return
+        if self.state_store:
+            self.state_store.save_page(progress.state)
+        if self.job:
+            self.job.mark_url(url, URL_DONE)
+
+    async def _enrich_worker(self, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+        while True:
+            item = await inbox.get()
+            if item is _STAGE_DONE:
+                return
+            url, chunk_idx, chunk_content, page_text, chunk_hash = item
+            cached = self.job.enriched_chunk(url, chunk_hash) if self.job else None
+            if cached:
+                # Enriched before the job was interrupted; skip the LLM calls
+                chunk = ProcessedChunk(url, cached["chunk_number"], cached["title"], cached["summary"],
+                                       cached["content"], cached["metadata"], None)
+                self.stats["chunks_resumed"] += 1
+                await outbox.put(chunk)
+                continue
+            try:
+                chunk = await enrich_chunk(chunk_content, chunk_idx, url, page_text)
+            except Exception as e:
+                log_error(f"Failed to process chunk {chunk_idx} from {url}. It will not be stored. Error: {e}")
+                await self._chunk_done(url, chunk_hash, None)
+                continue
+            chunk.metadata["chunk_hash"] = chunk_hash
+            self.stats["chunks_enriched"] += 1
+            if self.job:
+                self.job.record_enriched(url, chunk_hash, chunk.chunk_number, chunk.title, chunk.summary,
+                                         chunk.content, chunk.metadata)
+                # Two LLM calls per chunk, with the inputs truncated as in enrich_chunk
+                self.job.add_costs(llm_calls=2, estimated_tokens=_estimate_tokens(
+                    page_text[:10000], chunk_content[:2000], chunk_content[:3000]
+                ))
+            await outbox.put(chunk)
+
+    async def _next_batch(self, inbox: asyncio.Queue, batch_size: int) -> Tuple[List[Any], bool]:
+        """Collect up to ``batch_size`` items; returns ``(batch, finished)``."""
+        first = await inbox.get()
+        if first is _STAGE_DONE:
+            return [], True
+        batch = [first]
+        while len(batch) < batch_size:
+            try:
+                item = inbox.get_nowait()
+            except asyncio.QueueEmpty:
+                try:
+                    item = await asyncio.wait_for(inbox.get(), timeout=self.config.batch_wait)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STAGE_DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _embed_worker(self, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+        finished = False
+        while not finished:
+            batch, finished = await self._next_batch(inbox, self.config.embedding_batch_size)
+            if not batch:
+                continue
+            embeddings = await get_embeddings([chunk.content for chunk in batch])
+            if self.job:
+                self.job.add_costs(
+                    embedding_requests=1,
+                    embedded_chunks=sum(1 for embedding in embeddings if embedding is not None),
+                    estimated_tokens=_estimate_tokens(*(chunk.content for chunk in batch)),
+                )
+            for chunk, embedding in zip(batch, embeddings):
+                chunk.embedding = embedding
+                if embedding is not None:
+                    self.stats["chunks_embedded"] += 1
+                await outbox.put(chunk)
+
+    async def _store_worker(self, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]) -> None:
+        finished = False
+        while not finished:
+            batch, finished = await self._next_batch(inbox, self.config.store_batch_size)
+            if not batch:
+                continue
+            if not self.sink:
+                log_error(f"No crawl sink provided. Cannot store {len(batch)} chunks.")
+                stored = []
             else:
-                log_error(f"Failed to process chunk {i} from {url}. It will not be stored.")
-    else:
-        log_error(
-            f"Failed to crawl or get markdown for: {url}. Error: {result.error_message if result else 'Unknown error during crawl'}"
-        )
+                stored = await self.sink.write(batch)
+            self.stats["chunks_stored"] += len(stored)
+            stored_ids = set(stored)
+            for chunk in batch:
+                doc_id = _chunk_doc_id(chunk)
+                await self._chunk_done(chunk.url, chunk.metadata.get("chunk_hash"), doc_id if doc_id in stored_ids else None)
+
+async def crawl_and_process_url(url: str, web_crawler_instance: AsyncWebCrawler, 
+                                sink: Union[CrawlSink, chromadb.api.models.Collection.Collection],
+                                config: Optional[PipelineConfig] = None,
+                                state_store: Optional[CrawlStateStore] = None) -> Dict[str, int]:
+    """Crawl a single URL and store its enriched, embedded chunks."""
+    return await CrawlPipeline(web_crawler_instance, sink, config, state_store).run([url])
 
 async def run_crawler(urls_to_crawl: List[str], 
-                      chroma_collection: chromadb.api.models.Collection.Collection, # Now a required arg
+                      chroma_collection: chromadb.api.models.Collection.Collection | None = None,
                       max_concurrent_crawls: int = 3, 
-                      sitemap_url: str | None = None):
-    """Main function to run the crawler, storing results in the provided ChromaDB Collection."""
-    if not chroma_collection:
-        log_error("CRITICAL: ChromaDB collection was not provided to run_crawler. Crawled data will NOT be stored.")
+                      sitemap_url: str | None = None,
+                      config: Optional[PipelineConfig] = None,
+                      incremental: bool = True,
+                      force_recrawl: bool = False,
+                      state_store: Optional[CrawlStateStore] = None,
+                      sink: Optional[CrawlSink] = None,
+                      job_id: Optional[str] = None,
+                      track_job: bool = True,
+                      job_store: Optional[CrawlJobStore] = None) -> Dict[str, Any] | None:
+    """Main function to run the crawler, storing results in ``sink`` or the given ChromaDB Collection.
+
+    ``max_concurrent_crawls`` limits page fetches; ``config`` tunes the other stages.
+    With ``incremental`` (the default) unchanged pages and chunks are skipped using
+    the crawl state store; ``force_recrawl`` re-processes everything and refreshes it.
+    The sitemap is streamed into the URL frontier while pages are already being crawled.
+
+    With ``track_job`` (the default) the run is checkpointed as a crawl job; passing
+    the ``job_id`` of an unfinished job resumes it.
+    """
+    sink = as_crawl_sink(sink or chroma_collection)
+    if not sink:
+        log_error("CRITICAL: No crawl sink or ChromaDB collection was provided to run_crawler. Crawled data will NOT be stored.")
         # Decide if to proceed or exit. For now, let it "crawl" but not store if URLs are present.
         # If storing is essential, could raise an error here.
+    sink_name = sink.name if sink else "default"
 
-    target_urls = list(urls_to_crawl) 
-    if sitemap_url:
-        log_info(f"Fetching URLs from sitemap: {sitemap_url}")
-        sitemap_urls = get_urls_from_sitemap(sitemap_url)
-        if sitemap_urls:
-            log_info(f"Found {len(sitemap_urls)} URLs from sitemap.")
-            target_urls.extend(sitemap_urls)
+    pipeline_config = replace(config or PipelineConfig(), max_concurrent_crawls=max_concurrent_crawls)
+    frontier = URLFrontier(pipeline_config.max_concurrent_per_domain, pipeline_config.domain_delay)
+    owns_job_store = track_job and job_store is None
+    if owns_job_store:
+        job_store = CrawlJobStore()
+    job = None
+    if track_job:
+        job = job_store.job(job_id) if job_id else None
+        if job:
+            info = job.info()
+            if info["sink"] != sink_name:
+                log_warning(f"Resuming crawl job {job.id} into '{sink_name}', but it was started for '{info['sink']}'.")
+            if not sitemap_url and not info["sitemap_done"]:
+                sitemap_url = info["sitemap_url"]
+            log_info(f"Resuming crawl job {job.id}: {info['urls']}")
         else:
-            log_warning(f"No URLs found or error fetching sitemap: {sitemap_url}")
-    if not target_urls:
-        log_warning("No URLs provided and no URLs found from sitemap. Exiting crawler.")
-        return
-    unique_target_urls = sorted(list(set(u for u in target_urls if u and u.strip().startswith(('http://', 'https://')))))
-    log_info(f"Total unique and valid URLs to crawl: {len(unique_target_urls)}")
-    if not unique_target_urls:
-        log_warning("No valid URLs to crawl after filtering. Exiting.")
+            job = job_store.create_job(sink_name, sitemap_url, job_id)
+        # Explicitly requested URLs go ahead of sitemap entries
+        job.add_urls(
+            (normalize_url(url), 1.0, None) for url in urls_to_crawl
+            if url and url.strip().startswith(("http://", "https://"))
+        )
+        for url, priority, lastmod in job.urls_to_process(pipeline_config.max_retries):
+            frontier.add(url, priority, lastmod)
+    else:
+        for url in urls_to_crawl:
+            if url:
+                frontier.add(url, priority=1.0)
+    if not sitemap_url and not len(frontier):
+        log_warning("No valid URLs to crawl. Exiting crawler.")
+        if job:
+            job.set_status(JOB_COMPLETED)
+        if owns_job_store:
+            job_store.close()
         return
 
+    owns_state_store = incremental and state_store is None
+    if owns_state_store:
+        state_store = CrawlStateStore(namespace=sink_name)
     browser_config = BrowserConfig(
         headless=True,
         verbose=False,
@@ -329,53 +880,62 @@ async def run_crawler(urls_to_crawl: List[str],
     )
     web_crawler_instance = AsyncWebCrawler(config=browser_config) # Renamed for clarity
     await web_crawler_instance.start()
-    semaphore = asyncio.Semaphore(max_concurrent_crawls)
-    crawl_tasks = []
-    async def crawl_with_semaphore(url: str):
-        async with semaphore:
-            # Pass the provided chroma_collection to each task
-            await crawl_and_process_url(url, web_crawler_instance, chroma_collection)
-    for url_to_process in unique_target_urls:
-        crawl_tasks.append(crawl_with_semaphore(url_to_process))
-    if crawl_tasks:
-        await asyncio.gather(*crawl_tasks)
-    await web_crawler_instance.close()
-    log_info("Crawler run finished.")
-
-def get_urls_from_sitemap(sitemap_url: str) -> List[str]:
+    feeder = None
+    completed = False
     try:
-        log_info(f"Requesting sitemap: {sitemap_url}")
-        response = requests.get(sitemap_url, timeout=20) 
-        response.raise_for_status()
-        content_type = response.headers.get('Content-Type', '').lower()
-        if 'xml' not in content_type:
-            log_warning(
-                f"Warning: Sitemap URL {sitemap_url} returned content type {content_type}, not XML. Trying to parse anyway."
-            )
-        namespaces = {'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        try:
-            root = ElementTree.fromstring(response.content)
-        except ElementTree.ParseError as e:
-            log_error(
-                f"Failed to parse XML from {sitemap_url}. Error: {e}. Content (first 500 chars): {response.text[:500]}"
-            )
-            return []
-        url_elements = root.findall('.//sitemap:loc', namespaces)
-        if not url_elements:
-            url_elements = root.findall('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-        if not url_elements:
-             url_elements = root.findall('.//loc')
-        extracted_urls = [elem.text.strip() for elem in url_elements if elem.text and elem.text.strip()]
-        log_info(f"Extracted {len(extracted_urls)} URLs from {sitemap_url}")
-        return extracted_urls
-    except requests.exceptions.Timeout:
-        log_error(f"Timeout error fetching sitemap {sitemap_url}.")
-        return []
-    except requests.exceptions.RequestException as e:
-        log_error(f"Request error fetching sitemap {sitemap_url}: {e}")
-        return []
+        if job:
+            job.set_status(JOB_RUNNING)
+        if sitemap_url:
+            feeder = asyncio.create_task(_feed_sitemap(sitemap_url, frontier, job))
+        else:
+            frontier.close()
+        pipeline = CrawlPipeline(web_crawler_instance, sink, pipeline_config,
+                                 state_store if incremental else None, force=force_recrawl, job=job)
+        stats = await pipeline.run(frontier)
+        completed = True
+    finally:
+        if feeder and not feeder.done():
+            feeder.cancel()
+        await web_crawler_instance.close()
+        if owns_state_store:
+            state_store.close()
+        if job:
+            job.set_status(JOB_COMPLETED if completed else JOB_INTERRUPTED)
+        if owns_job_store:
+            job_store.close()
+    log_info(f"Crawler run finished. {frontier.seen_count} unique URLs were queued.")
+    if job:
+        stats["job_id"] = job.id
+    return stats
+
+async def resume_crawl_job(job_id: str, sink: Optional[CrawlSink] = None, **kwargs: Any) -> Dict[str, Any] | None:
+    """Resume an interrupted crawl job; ``kwargs`` are passed to ``run_crawler``."""
+    return await run_crawler([], sink=sink, job_id=job_id, **kwargs)
+
+async def _feed_sitemap(sitemap_url: str, frontier: URLFrontier, job: Optional[CrawlJob] = None) -> None:
+    try:
+        log_info(f"Fetching URLs from sitemap: {sitemap_url}")
+        if job is None:
+            if not await feed_frontier_from_sitemap(sitemap_url, frontier):
+                log_warning(f"No new URLs found or error fetching sitemap: {sitemap_url}")
+            return
+        # Record sitemap URLs in the job as they stream in, so a resumed job knows them
+        batch = []
+        async for entry in iter_sitemap(sitemap_url):
+            if frontier.add_entry(entry):
+                batch.append((normalize_url(entry.url), entry.priority, entry.lastmod))
+            if len(batch) >= 500:
+                job.add_urls(batch)
+                batch = []
+        job.add_urls(batch)
+        job.set_sitemap_done()
     except Exception as e:
         log_error(f"An unexpected error occurred while processing sitemap {sitemap_url}: {e}")
-        return []
+    finally:
+        frontier.close()
+
+async def get_urls_from_sitemap(sitemap_url: str) -> List[str]:
+    """Collect every URL of a sitemap, following sitemap-index children."""
+    return [entry.url async for entry in iter_sitemap(sitemap_url)]
 
-# Removed main_crawl_example and if __name__ == "__main__" block 
\ No newline at end of file
+# Removed main_crawl_example and if __name__ == "__main__" block 
@@ -0,0 +1,278 @@
+"""Streaming sitemap reader and crawl URL frontier.
+
+Sitemaps are read incrementally over an httpx stream and parsed with a pull
+parser, so a 100k-URL sitemap never has to be held in memory as a DOM and
+parsing never blocks the event loop for long. Gzipped sitemaps (.xml.gz) and
+sitemap indexes are supported; child sitemaps are followed recursively.
+
+Entries feed a ``URLFrontier``, which deduplicates URLs, hands them out by
+priority and recency, and caps concurrent requests per domain.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urlparse
+from xml.etree.ElementTree import XMLPullParser
+
+import httpx
+
+from src.utils.logging import log_info, log_warning, log_error
+
+
+DEFAULT_PRIORITY = 0.5
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class SitemapEntry:
+    """One <url> entry of a sitemap."""
+    url: str
+    lastmod: Optional[str] = None
+    priority: float = DEFAULT_PRIORITY
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    for child in element:
+        if _local_name(child.tag) == name and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _parse_priority(value: Optional[str]) -> float:
+    try:
+        return min(max(float(value), 0.0), 1.0) if value else DEFAULT_PRIORITY
+    except ValueError:
+        return DEFAULT_PRIORITY
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used to deduplicate URLs (whitespace and fragment removed)."""
+    return urldefrag(url.strip())[0]
+
+
+def _lastmod_timestamp(value: Optional[str]) -> float:
+    """Seconds since the epoch for a W3C datetime, 0 when missing or invalid."""
+    if not value:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+async def iter_sitemap(
+    sitemap_url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    max_depth: int = 3,
+    _seen: Optional[Set[str]] = None,
+) -> AsyncIterator[SitemapEntry]:
+    """Stream the entries of a sitemap, following sitemap-index children.
+
+    Args:
+        sitemap_url: URL of a sitemap or sitemap index, optionally gzipped
+        client: httpx client to reuse; one is created when omitted
+        max_depth: How many levels of nested sitemap indexes to follow
+
+    Yields:
+        SitemapEntry for every <url> found, as soon as it is parsed
+    """
+    if client is None:
+        async with httpx.AsyncClient(timeout=30, follow_redirects=True) as own_client:
+            async for entry in iter_sitemap(sitemap_url, own_client, max_depth, _seen):
+                yield entry
+        return
+
+    seen = _seen if _seen is not None else set()
+    if sitemap_url in seen:
+        return
+    seen.add(sitemap_url)
+
+    children: List[str] = []
+    parser = XMLPullParser(events=("start", "end"))
+    root = None
+    decompressor = None
+    first_chunk = True
+    count = 0
+    log_info(f"Requesting sitemap: {sitemap_url}")
+    try:
+        async with client.stream("GET", sitemap_url) as response:
+            response.raise_for_status()
+            # aiter_bytes undoes Content-Encoding; .xml.gz files still arrive gzipped
+            async for data in response.aiter_bytes():
+                if first_chunk and data.startswith(_GZIP_MAGIC):
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                first_chunk = False
+                if decompressor is not None:
+                    data = decompressor.decompress(data)
+                parser.feed(data)
+                for event, element in parser.read_events():
+                    if event == "start":
+                        if root is None:
+                            root = element
+                        continue
+                    name = _local_name(element.tag)
+                    if name == "url":
+                        loc = _child_text(element, "loc")
+                        if loc:
+                            count += 1
+                            yield SitemapEntry(loc, _child_text(element, "lastmod"),
+                                               _parse_priority(_child_text(element, "priority")))
+                    elif name == "sitemap":
+                        loc = _child_text(element, "loc")
+                        if loc:
+                            children.append(loc)
+                    else:
+                        continue
+                    # Drop finished entries so memory stays flat on huge sitemaps
+                    root.clear()
+            if decompressor is not None:
+                parser.feed(decompressor.flush())
+            parser.close()
+    except httpx.HTTPError as e:
+        log_error(f"Request error fetching sitemap {sitemap_url}: {e}")
+    except SyntaxError as e:
+        # ElementTree.ParseError is a SyntaxError subclass
+        log_error(f"Failed to parse XML from {sitemap_url}. Error: {e}")
+    log_info(f"Extracted {count} URLs and {len(children)} child sitemaps from {sitemap_url}")
+
+    if children and max_depth <= 0:
+        log_warning(f"Not following {len(children)} child sitemaps of {sitemap_url}: maximum depth reached.")
+        return
+    for child in children:
+        async for entry in iter_sitemap(child, client, max_depth - 1, seen):
+            yield entry
+
+
+class URLFrontier:
+    """Deduplicating queue of URLs to crawl with per-domain politeness.
+
+    URLs come out highest priority first, then most recently modified. At
+    most ``max_per_domain`` URLs of one domain are handed out at a time, and
+    ``domain_delay`` seconds separate consecutive requests to a domain.
+    Consumers call ``get()`` until it returns None, and ``done(url)`` after
+    each fetch; producers call ``close()`` once they have added everything.
+    """
+
+    def __init__(self, max_per_domain: int = 2, domain_delay: float = 0.0, max_urls: Optional[int] = None):
+        self.max_per_domain = max(1, max_per_domain)
+        self.domain_delay = domain_delay
+        self.max_urls = max_urls
+        self._seen: Set[str] = set()
+        self._heaps: Dict[str, List[Tuple[float, float, int, str]]] = defaultdict(list)
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._next_allowed: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._changed = asyncio.Event()
+        self._closed = False
+        self._pending = 0
+
+    def __len__(self) -> int:
+        """Number of URLs waiting to be handed out."""
+        return self._pending
+
+    @property
+    def seen_count(self) -> int:
+        return len(self._seen)
+
+    def add(self, url: str, priority: float = DEFAULT_PRIORITY, lastmod: Optional[str] = None) -> bool:
+        """Queue ``url`` unless it was already seen; returns whether it was added."""
+        url = normalize_url(url)
+        if not url.startswith(("http://", "https://")) or url in self._seen:
+            return False
+        if self.max_urls is not None and len(self._seen) >= self.max_urls:
+            return False
+        self._seen.add(url)
+        domain = urlparse(url).netloc
+        heapq.heappush(self._heaps[domain], (-priority, -_lastmod_timestamp(lastmod), next(self._counter), url))
+        self._pending += 1
+        self._changed.set()
+        return True
+
+    def add_entry(self, entry: SitemapEntry) -> bool:
+        return self.add(entry.url, entry.priority, entry.lastmod)
+
+    def requeue(self, url: str, priority: float = DEFAULT_PRIORITY) -> None:
+        """Queue a URL that was already handed out again, e.g. to retry it."""
+        domain = urlparse(url).netloc
+        heapq.heappush(self._heaps[domain], (-priority, 0.0, next(self._counter), url))
+        self._pending += 1
+        self._changed.set()
+
+    def close(self) -> None:
+        """Signal that no more URLs will be added."""
+        self._closed = True
+        self._changed.set()
+
+    def done(self, url: str) -> None:
+        """Release the domain slot taken by ``url``."""
+        domain = urlparse(url).netloc
+        if self._in_flight[domain] > 0:
+            self._in_flight[domain] -= 1
+        self._changed.set()
+
+    def _take(self, now: float) -> Tuple[Optional[str], Optional[float]]:
+        """Pop the best URL that may be fetched now, or return how long to wait."""
+        best_domain, wait = None, None
+        for domain, heap in self._heaps.items():
+            if not heap or self._in_flight[domain] >= self.max_per_domain:
+                continue
+            ready_at = self._next_allowed.get(domain, 0.0)
+            if ready_at > now:
+                wait = min(wait if wait is not None else math.inf, ready_at - now)
+                continue
+            if best_domain is None or heap[0] < self._heaps[best_domain][0]:
+                best_domain = domain
+        if best_domain is None:
+            return None, wait
+        url = heapq.heappop(self._heaps[best_domain])[3]
+        self._pending -= 1
+        self._in_flight[best_domain] += 1
+        self._next_allowed[best_domain] = now + self.domain_delay
+        return url, None
+
+    async def get(self) -> Optional[str]:
+        """Wait for the next URL; returns None once closed, drained and idle.
+
+        While URLs are still in flight the frontier stays open, since a
+        failed fetch may be requeued.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            url, wait = self._take(loop.time())
+            if url is not None:
+                return url
+            if self._closed and self._pending == 0 and not any(self._in_flight.values()):
+                return None
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def feed_frontier_from_sitemap(sitemap_url: str, frontier: URLFrontier,
+                                     client: Optional[httpx.AsyncClient] = None) -> int:
+    """Stream a sitemap into ``frontier``; returns how many new URLs were added."""
+    added = 0
+    try:
+        async for entry in iter_sitemap(sitemap_url, client):
+            if frontier.add_entry(entry):
+                added += 1
+    except Exception as e:
+        log_error(f"An unexpected error occurred while processing sitemap {sitemap_url}: {e}")
+    log_info(f"Queued {added} URLs from sitemap {sitemap_url}")
+    return added
@@ -0,0 +1,274 @@
+"""Incremental rollups of daily work logs.
+
+``LogRollups`` keeps hours and entry counts per day and per task key (the
+log's task id, falling back to its log id), with the days held in sorted
+order. Reports are answered from these rollups instead of rescanning every
+log entry:
+
+- the most recent log day before a date (the "yesterday" summary)
+- hours per task, day, ISO week or tag over a date range
+- burn-down of remaining estimate over a date range
+
+Rollup rows use the same shape as the Supabase ``daily_log_rollups`` table
+(``log_date``, ``task_key``, ``hours``, ``entries``), so ``summarize_rollups``
+and ``burndown`` serve both backends.
+
+For the YAML backend, ``load_log_rollups`` caches rollups per file version
+like ``load_task_snapshot``. Writers call ``apply_log_changes`` after saving,
+which patches the cached rollups with just the changed entries instead of
+reparsing and re-aggregating the whole file.
+"""
+
+import bisect
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+
+from src.utils.logging import log_info
+
+
+ROLLUP_GROUPS = ("task", "day", "week", "tag")
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _iso_day(value: Any) -> Optional[str]:
+    """Normalize a logs key to an ISO date string, or None if it is not a date."""
+    try:
+        return datetime.fromisoformat(str(value)).date().isoformat()
+    except (ValueError, TypeError):
+        return None
+
+
+def _hours(entry: Dict[str, Any]) -> float:
+    try:
+        return float(entry.get("actual_hours", 0) or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def log_task_key(entry: Dict[str, Any]) -> str:
+    """Key a log entry is rolled up under."""
+    return str(entry.get("task_id") or entry.get("log_id") or "UNKNOWN")
+
+
+class LogRollups:
+    """Per-day, per-task hour totals maintained incrementally."""
+
+    def __init__(self, logs: Optional[Dict[Any, Any]] = None, version: Optional[Tuple[int, ...]] = None):
+        self.version = version
+        self.logs: Dict[str, Any] = {}
+        self._daily: Dict[str, Dict[str, List[float]]] = {}
+        self._dates: List[str] = []
+        self.entry_count = 0
+        if logs:
+            self.rebuild(logs)
+
+    def rebuild(self, logs: Dict[Any, Any]) -> None:
+        """Recompute every rollup from a full logs mapping."""
+        self.logs = logs
+        self._daily = {}
+        self._dates = []
+        self.entry_count = 0
+        for day, entries in logs.items():
+            for entry in entries or []:
+                if isinstance(entry, dict):
+                    self.add(day, entry)
+        log_info(f"Built log rollups ({self.entry_count} entries over {len(self._dates)} days)")
+
+    def add(self, day: Any, entry: Dict[str, Any]) -> None:
+        """Count one log entry."""
+        self._apply(day, entry, 1)
+
+    def remove(self, day: Any, entry: Dict[str, Any]) -> None:
+        """Uncount one log entry."""
+        self._apply(day, entry, -1)
+
+    def update(self, day: Any, old_entry: Dict[str, Any], new_entry: Dict[str, Any],
+               new_day: Optional[Any] = None) -> None:
+        """Replace one counted entry with its edited version."""
+        self.remove(day, old_entry)
+        self.add(day if new_day is None else new_day, new_entry)
+
+    def _apply(self, day: Any, entry: Dict[str, Any], sign: int) -> None:
+        day_str = _iso_day(day)
+        if day_str is None:
+            return
+
+        tasks = self._daily.get(day_str)
+        if tasks is None:
+            if sign < 0:
+                return
+            tasks = self._daily[day_str] = {}
+            bisect.insort(self._dates, day_str)
+
+        key = log_task_key(entry)
+        totals = tasks.setdefault(key, [0.0, 0])
+        totals[0] += sign * _hours(entry)
+        totals[1] += sign
+        self.entry_count += sign
+
+        if totals[1] <= 0:
+            del tasks[key]
+        if not tasks:
+            del self._daily[day_str]
+            self._dates.pop(bisect.bisect_left(self._dates, day_str))
+
+    def latest_date_before(self, target_date: date) -> Optional[date]:
+        """Most recent day with logs strictly before ``target_date``."""
+        i = bisect.bisect_left(self._dates, target_date.isoformat())
+        return date.fromisoformat(self._dates[i - 1]) if i else None
+
+    def rows(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[Dict[str, Any]]:
+        """Rollup rows for days in ``[start, end]``, in date order."""
+        lo = bisect.bisect_left(self._dates, start.isoformat()) if start else 0
+        hi = bisect.bisect_right(self._dates, end.isoformat()) if end else len(self._dates)
+        for day_str in self._dates[lo:hi]:
+            for key, (hours, entries) in self._daily[day_str].items():
+                yield {"log_date": day_str, "task_key": key, "hours": round(hours, 4), "entries": entries}
+
+    def summarize(self, group_by: str = "task", start: Optional[date] = None, end: Optional[date] = None,
+                  task_tags: Optional[Dict[str, List[str]]] = None) -> Dict[str, float]:
+        """Hours grouped by task, day, week or tag."""
+        return summarize_rollups(self.rows(start, end), group_by, task_tags)
+
+
+def _week_key(day: str) -> str:
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def summarize_rollups(rows: Iterable[Dict[str, Any]], group_by: str = "task",
+                      task_tags: Optional[Dict[str, List[str]]] = None) -> Dict[str, float]:
+    """Aggregate rollup rows into hours per task, day, ISO week or tag.
+
+    Args:
+        rows: Rollup rows with ``log_date``, ``task_key`` and ``hours``
+        group_by: One of ``ROLLUP_GROUPS``
+        task_tags: Tags per task id, required for ``group_by="tag"``;
+            hours on untagged tasks are reported under ``"untagged"``
+    """
+    if group_by not in ROLLUP_GROUPS:
+        raise ValueError(f"group_by must be one of {', '.join(ROLLUP_GROUPS)}")
+
+    totals: Dict[str, float] = {}
+    for row in rows:
+        hours = float(row["hours"])
+        day = str(row["log_date"])
+        if group_by == "task":
+            keys = [row["task_key"]]
+        elif group_by == "day":
+            keys = [day]
+        elif group_by == "week":
+            keys = [_week_key(day)]
+        else:
+            keys = (task_tags or {}).get(row["task_key"]) or ["untagged"]
+        for key in keys:
+            totals[key] = totals.get(key, 0.0) + hours
+    return {key: round(value, 2) for key, value in totals.items()}
+
+
+def burndown(rows: Iterable[Dict[str, Any]], total_estimate: float, start: date, end: date,
+             task_keys: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Remaining estimate at the end of each day in ``[start, end]``.
+
+    Args:
+        rows: Rollup rows covering at least ``[start, end]``
+        total_estimate: Estimated hours at the start of the range
+        start: First day of the report
+        end: Last day of the report
+        task_keys: Only count hours logged against these tasks
+    """
+    keys = set(task_keys) if task_keys is not None else None
+    per_day: Dict[str, float] = {}
+    for row in rows:
+        if keys is not None and row["task_key"] not in keys:
+            continue
+        day = str(row["log_date"])
+        per_day[day] = per_day.get(day, 0.0) + float(row["hours"])
+
+    report = []
+    remaining = float(total_estimate)
+    day = start
+    while day <= end:
+        logged = per_day.get(day.isoformat(), 0.0)
+        remaining = max(0.0, remaining - logged)
+        report.append({"date": day.isoformat(), "logged": round(logged, 2), "remaining": round(remaining, 2)})
+        day += timedelta(days=1)
+    return report
+
+
+_ROLLUP_CACHE: Dict[str, LogRollups] = {}
+
+
+def _file_version(path: str) -> Tuple[int, int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def load_log_rollups(path: str) -> LogRollups:
+    """Load rollups for the daily logs YAML at ``path``, reusing them while the file is unchanged.
+
+    The ``logs`` mapping on the result is shared with the cache and must be
+    treated as read-only by callers.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file does not contain a mapping of dates to entries
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"YAML file not found: {path}")
+    key = os.path.abspath(path)
+    version = _file_version(path)
+    cached = _ROLLUP_CACHE.get(key)
+    if cached is not None and cached.version == version:
+        return cached
+
+    with open(path, "r", encoding="utf-8") as fh:
+        logs = yaml.load(fh, Loader=_YAML_LOADER) or {}
+    if not isinstance(logs, dict):
+        raise ValueError("Invalid YAML structure")
+    logs = {str(k): v for k, v in logs.items()}
+
+    rollups = LogRollups(logs, version)
+    _ROLLUP_CACHE[key] = rollups
+    return rollups
+
+
+def apply_log_changes(path: str, logs: Dict[str, Any],
+                      added: Iterable[Tuple[str, Dict[str, Any]]] = (),
+                      removed: Iterable[Tuple[str, Dict[str, Any]]] = ()) -> None:
+    """Patch cached rollups after ``logs`` was written to ``path``.
+
+    Only the changed ``(date, entry)`` pairs are applied. If the cached
+    rollups no longer line up with ``logs`` (the file was edited elsewhere),
+    they are rebuilt from ``logs`` without reparsing the file. Nothing is
+    cached for files that were never loaded.
+    """
+    key = os.path.abspath(path)
+    cached = _ROLLUP_CACHE.get(key)
+    if cached is None:
+        return
+
+    for day, entry in removed:
+        cached.remove(day, entry)
+    for day, entry in added:
+        cached.add(day, entry)
+
+    # Cheap consistency check: O(days), not O(entries)
+    expected = sum(len(entries or []) for day, entries in logs.items() if _iso_day(day) is not None)
+    if cached.entry_count != expected:
+        cached.rebuild(logs)
+    cached.logs = logs
+
+    try:
+        cached.version = _file_version(path)
+    except OSError:
+        _ROLLUP_CACHE.pop(key, None)
+
+
+def clear_rollup_cache() -> None:
+    """Drop all cached rollups."""
+    _ROLLUP_CACHE.clear()
@@ -47,6 +47,10 @@ class SupabaseClient:
     def get_logs_table(self):
         """Get the daily_logs table reference."""
         return self.client.table("daily_logs")
+    
+    def get_log_rollups_table(self):
+        """Get the daily_log_rollups table reference."""
+        return self.client.table("daily_log_rollups")
 
 
 def get_supabase_client() -> SupabaseClient:
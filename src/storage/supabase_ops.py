@@ -1,8 +1,9 @@
 """Supabase operations for tasks and daily logs management."""
 
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import uuid
+from src.storage.log_rollups import summarize_rollups, burndown
 from src.utils.logging import log_info, log_error
 from src.storage.supabase_client import get_supabase_client
 
@@ -229,6 +230,65 @@ class SupabaseOperations:
             log_error(f"Error fetching logs: {str(e)}")
             return []
     
+    def get_log_rollups(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get per-day, per-task hour rollups, maintained by a trigger on daily_logs."""
+        try:
+            query = self.client.get_log_rollups_table().select("log_date, task_key, hours, entries")
+            if start_date:
+                query = query.gte("log_date", start_date)
+            if end_date:
+                query = query.lte("log_date", end_date)
+            result = query.order("log_date").execute()
+            return result.data if result.data else []
+        except Exception as e:
+            log_error(f"Error fetching log rollups: {str(e)}")
+            return []
+    
+    def get_hours_summary(self, group_by: str = "task", start_date: Optional[str] = None,
+                          end_date: Optional[str] = None) -> Dict[str, Any]:
+        """Summarize logged hours by task, day, week or tag from the rollups."""
+        try:
+            rows = self.get_log_rollups(start_date, end_date)
+            task_tags = None
+            if group_by == "tag":
+                keys = sorted({row["task_key"] for row in rows})
+                tasks = self.client.get_tasks_table().select("id, tags").in_("id", keys).execute() if keys else None
+                task_tags = {task["id"]: task.get("tags") or [] for task in (tasks.data if tasks else [])}
+            
+            totals = summarize_rollups(rows, group_by, task_tags)
+            return {
+                "success": True,
+                "group_by": group_by,
+                "hours": totals,
+                # Tasks with several tags count towards each, so total from the rows
+                "total_hours": round(sum(float(row["hours"]) for row in rows), 2)
+            }
+        except Exception as e:
+            log_error(f"Error summarizing hours: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    def get_burndown(self, start_date: str, end_date: str, task_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Report remaining estimated hours per day from the log rollups."""
+        try:
+            query = self.client.get_tasks_table().select("id, estimate_hours")
+            if task_ids:
+                query = query.in_("id", task_ids)
+            tasks = query.execute().data or []
+            total_estimate = sum(float(task.get("estimate_hours") or 0) for task in tasks)
+            
+            rows = self.get_log_rollups(start_date, end_date)
+            report = burndown(
+                rows,
+                total_estimate,
+                date.fromisoformat(start_date),
+                date.fromisoformat(end_date),
+                task_keys=[task["id"] for task in tasks] if task_ids else None
+            )
+            return {"success": True, "total_estimate": round(total_estimate, 2), "days": report}
+        except Exception as e:
+            log_error(f"Error building burndown: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
     def get_logs_by_date(self, date: str) -> List[Dict[str, Any]]:
         """Get logs for a specific date."""
         try:
@@ -302,4 +362,150 @@ class SupabaseOperations:
             }
             
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}    
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply several task and log operations with bulk writes.
+        
+        Tasks are read once and every operation is validated against that
+        in-memory copy, so nothing is written if any operation fails. The
+        changes are then sent as at most one insert, one upsert and one
+        delete on the tasks table plus one insert on the logs table.
+        """
+        try:
+            result = self.client.get_tasks_table().select("*").execute()
+            tasks = list(result.data or [])
+            
+            new_tasks: Dict[str, Dict[str, Any]] = {}
+            updated_tasks: Dict[str, Dict[str, Any]] = {}
+            deleted_ids: List[str] = []
+            new_logs: List[Dict[str, Any]] = []
+            results = []
+            
+            def insert_task(data: Dict[str, Any]) -> Dict[str, Any]:
+                title = data.get("title", "New task")
+                if any(t.get("title") == title for t in tasks):
+                    return {"success": False, "error": f"Task with title '{title}' already exists"}
+                
+                custom_id = data.get("id") or data.get("identifier")
+                if custom_id and any(t.get("id") == custom_id for t in tasks):
+                    return {"success": False, "error": f"Task with ID '{custom_id}' already exists"}
+                
+                task = {
+                    "id": custom_id or generate_task_id(),
+                    "title": title,
+                    "description": data.get("description"),
+                    "priority": data.get("priority", "medium"),
+                    "status": data.get("status", "pending"),
+                    "tags": data.get("tags", []),
+                    "due_date": data.get("due_date", (datetime.now().date() + timedelta(weeks=1)).isoformat()),
+                    "estimate_hours": data.get("estimate_hours"),
+                    "todo": data.get("todo")
+                }
+                tasks.append(task)
+                new_tasks[task["id"]] = task
+                return {"success": True, "task": task}
+            
+            for position, operation in enumerate(operations, start=1):
+                action = operation.get("action")
+                data = dict(operation.get("data") or {})
+                
+                if action == "add_task":
+                    op_result = insert_task(data)
+                
+                elif action in ("update_task", "remove_task"):
+                    identifier = data.get("identifier", "")
+                    task = find_task_by_identifier(tasks, identifier)
+                    if not task:
+                        op_result = {"success": False, "error": f"Task '{identifier}' not found"}
+                    elif action == "update_task":
+                        changes = []
+                        for field, value in data.get("updates", {}).items():
+                            if field == "add_tags":
+                                task["tags"] = list(set((task.get("tags") or []) + value))
+                                changes.append(f"added tags: {', '.join(value)}")
+                            elif field == "remove_tags":
+                                task["tags"] = [t for t in (task.get("tags") or []) if t not in value]
+                                changes.append(f"removed tags: {', '.join(value)}")
+                            else:
+                                old_value = task.get(field, "not set")
+                                task[field] = value
+                                changes.append(f"{field}: {old_value} → {value}")
+                        # Tasks added in this batch are inserted with their updates applied
+                        if task["id"] not in new_tasks:
+                            updated_tasks[task["id"]] = task
+                        op_result = {
+                            "success": True,
+                            "task": task,
+                            "changes": changes,
+                            "message": f"Updated task '{task['title']}': {'; '.join(changes)}"
+                        }
+                    else:
+                        tasks.remove(task)
+                        if new_tasks.pop(task["id"], None) is None:
+                            updated_tasks.pop(task["id"], None)
+                            deleted_ids.append(task["id"])
+                        op_result = {"success": True, "message": f"Removed task '{task['title']}' ({task['id']})"}
+                
+                elif action == "add_log":
+                    op_result = None
+                    task_id = data.get("task_id")
+                    if "task_title" in data and not task_id and "log_id" not in data:
+                        task = find_task_by_identifier(tasks, data["task_title"])
+                        if not task:
+                            op_result = {"success": False, "error": f"Task '{data['task_title']}' not found"}
+                        else:
+                            task_id = task["id"]
+                    elif not task_id and "log_id" not in data and data.get("description"):
+                        task_result = insert_task({"title": data["description"]})
+                        if not task_result["success"]:
+                            op_result = task_result
+                        else:
+                            task_id = task_result["task"]["id"]
+                    
+                    if op_result is None:
+                        log_date = data.get("date", datetime.now().date().isoformat())
+                        log_entry = {
+                            "log_date": log_date,
+                            "log_id": data.get("log_id", task_id or f"LOG-{uuid.uuid4().hex[:8].upper()}"),
+                            "description": data.get("description", ""),
+                            "actual_hours": float(data.get("hours", data.get("actual_hours", 0))),
+                            "task_id": task_id
+                        }
+                        new_logs.append(log_entry)
+                        op_result = {"success": True, "log": log_entry, "date": log_date}
+                
+                else:
+                    op_result = {"success": False, "error": f"Action '{action}' is not supported in a Supabase batch"}
+                
+                results.append({"action": action, **op_result})
+                if not op_result["success"]:
+                    log_error(f"Batch operation {position} ({action}) failed: {op_result['error']}")
+                    return {
+                        "success": False,
+                        "error": f"Operation {position} ({action}) failed: {op_result['error']}",
+                        "results": results
+                    }
+            
+            # Bulk writes: tasks first so new logs can reference them
+            if new_tasks:
+                self.client.get_tasks_table().insert(list(new_tasks.values())).execute()
+            if updated_tasks:
+                self.client.get_tasks_table().upsert(list(updated_tasks.values()), on_conflict="id").execute()
+            if new_logs:
+                self.client.get_logs_table().insert(new_logs).execute()
+            if deleted_ids:
+                self.client.get_tasks_table().delete().in_("id", deleted_ids).execute()
+            
+            log_info(
+                f"Applied batch of {len(results)} operations: {len(new_tasks)} added, "
+                f"{len(updated_tasks)} updated, {len(deleted_ids)} removed, {len(new_logs)} logs"
+            )
+            return {
+                "success": True,
+                "results": results,
+                "message": f"Applied {len(results)} operations"
+            }
+            
+        except Exception as e:
+            log_error(f"Error applying batch: {str(e)}")
+            return {"success": False, "error": str(e)}
@@ -100,26 +100,7 @@ class SupabaseVectorClient:
             # Generate embeddings
             embeddings = self._get_embeddings(documents)
             
-            # Prepare data for insertion
-            records = []
-            for i, (doc, embedding, doc_id, metadata) in enumerate(
-                zip(documents, embeddings, ids, metadatas)
-            ):
-                record = {
-                    "collection_name": self.collection_name,
-                    "document_id": doc_id,
-                    "content": doc,
-                    "embedding": embedding,
-                    "metadata": json.dumps(metadata) if metadata else json.dumps({}),
-                    "user_id": self.user_id
-                }
-                records.append(record)
-            
-            # Upsert into Supabase (update if exists, insert if not)
-            result = self.client.table("document_embeddings").upsert(
-                records,
-                on_conflict="collection_name,document_id"
-            ).execute()
+            self.upsert_embeddings(ids, documents, embeddings, metadatas)
             
             log_info(f"Added {len(documents)} documents to collection '{self.collection_name}'")
             
@@ -127,6 +108,52 @@ class SupabaseVectorClient:
             log_error(f"Failed to add documents: {str(e)}")
             raise
     
+    def upsert_embeddings(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        batch_size: int = 500
+    ) -> List[str]:
+        """Upsert documents whose embeddings were computed elsewhere.
+        
+        Rows are written in batches of ``batch_size``, one round trip each.
+        
+        Args:
+            ids: Document IDs
+            documents: Document texts
+            embeddings: Embedding vector for each document
+            metadatas: Optional metadata for each document
+            batch_size: Rows per upsert request
+            
+        Returns:
+            IDs that were written
+        """
+        if metadatas is None:
+            metadatas = [{} for _ in documents]
+        
+        records = [
+            {
+                "collection_name": self.collection_name,
+                "document_id": doc_id,
+                "content": doc,
+                "embedding": embedding,
+                "metadata": json.dumps(metadata) if metadata else json.dumps({}),
+                "user_id": self.user_id
+            }
+            for doc_id, doc, embedding, metadata in zip(ids, documents, embeddings, metadatas)
+        ]
+        
+        for start in range(0, len(records), batch_size):
+            # Upsert into Supabase (update if exists, insert if not)
+            self.client.table("document_embeddings").upsert(
+                records[start:start + batch_size],
+                on_conflict="collection_name,document_id"
+            ).execute()
+        
+        return [record["document_id"] for record in records]
+    
     def query(
         self,
         query_texts: List[str],
@@ -142,7 +142,8 @@ class TestBrainstormIntegration:
         manager = BrainstormManager(
             brainstorm_file=self.paths['brainstorms'],
             tasks_file=self.paths['tasks'],
-            task_details_file=self.paths['task_details']
+            task_details_file=self.paths['task_details'],
+            data_dir=os.path.dirname(self.paths['task_details'])
         )
         
         # Test brainstorming for task 111025
@@ -217,7 +218,8 @@ Previous RAG context about TestRail.
         manager = BrainstormManager(
             brainstorm_file=self.paths['brainstorms'],
             tasks_file=self.paths['tasks'],
-            task_details_file=self.paths['task_details']
+            task_details_file=self.paths['task_details'],
+            data_dir=os.path.dirname(self.paths['task_details'])
         )
         
         # Test getting existing brainstorm
@@ -278,7 +280,8 @@ Old brainstorm content that will be replaced.
         manager = BrainstormManager(
             brainstorm_file=self.paths['brainstorms'],
             tasks_file=self.paths['tasks'],
-            task_details_file=self.paths['task_details']
+            task_details_file=self.paths['task_details'],
+            data_dir=os.path.dirname(self.paths['task_details'])
         )
         
         # Test replacing existing brainstorm
@@ -303,7 +306,8 @@ Old brainstorm content that will be replaced.
         manager = BrainstormManager(
             brainstorm_file=self.paths['brainstorms'],
             tasks_file=self.paths['tasks'],
-            task_details_file=self.paths['task_details']
+            task_details_file=self.paths['task_details'],
+            data_dir=os.path.dirname(self.paths['task_details'])
         )
         
         result = manager.process_brainstorm_query('brainstorm task id NON-EXISTENT')
@@ -343,7 +347,8 @@ Old brainstorm content that will be replaced.
             manager = BrainstormManager(
                 brainstorm_file=self.paths['brainstorms'],
                 tasks_file=self.paths['tasks'],
-                task_details_file=self.paths['task_details']
+                task_details_file=self.paths['task_details'],
+                data_dir=os.path.dirname(self.paths['task_details'])
             )
             
             # Test brainstorming by partial title match
@@ -358,7 +363,8 @@ Old brainstorm content that will be replaced.
         manager = BrainstormManager(
             brainstorm_file=self.paths['brainstorms'],
             tasks_file=self.paths['tasks'],
-            task_details_file=self.paths['task_details']
+            task_details_file=self.paths['task_details'],
+            data_dir=os.path.dirname(self.paths['task_details'])
         )
         
         invalid_queries = [
@@ -403,7 +409,8 @@ Old brainstorm content that will be replaced.
             manager = BrainstormManager(
                 brainstorm_file=self.paths['brainstorms'],
                 tasks_file=self.paths['tasks'],
-                task_details_file=self.paths['task_details']
+                task_details_file=self.paths['task_details'],
+                data_dir=os.path.dirname(self.paths['task_details'])
             )
             
             result = manager.process_brainstorm_query('brainstorm task id 111025')
@@ -434,7 +441,8 @@ Old brainstorm content that will be replaced.
             manager = BrainstormManager(
                 brainstorm_file=self.paths['brainstorms'],
                 tasks_file=self.paths['tasks'],
-                task_details_file=self.paths['task_details']
+                task_details_file=self.paths['task_details'],
+                data_dir=os.path.dirname(self.paths['task_details'])
             )
             
             result = manager.process_brainstorm_query('brainstorm task id 111025')
@@ -478,7 +486,8 @@ Old brainstorm content that will be replaced.
         manager = BrainstormManager(
             brainstorm_file=self.paths['brainstorms'],
             tasks_file=self.paths['tasks'],
-            task_details_file=self.paths['task_details']
+            task_details_file=self.paths['task_details'],
+            data_dir=os.path.dirname(self.paths['task_details'])
         )
         
         # Test brainstorming - should NOT fail with string indices error
@@ -719,7 +728,8 @@ class TestEndToEndWorkflow:
         manager = BrainstormManager(
             brainstorm_file=self.brainstorm_file.name,
             tasks_file=self.tasks_file.name,
-            task_details_file=self.details_file.name
+            task_details_file=self.details_file.name,
+            data_dir=os.path.dirname(self.details_file.name)
         )
         
         # Step 1: Initial brainstorm
@@ -0,0 +1,242 @@
+"""Tests for the staged crawl pipeline."""
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from src.processors import crawler
+from src.processors.crawl_state import CrawlStateStore
+from src.processors.crawler import CrawlPipeline, PipelineConfig
+
+
+class FakeCrawler:
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched: List[str] = []
+
+    async def arun(self, url, config=None):
+        await asyncio.sleep(0)
+        self.fetched.append(url)
+        if url not in self.pages:
+            return SimpleNamespace(success=False, markdown=None, error_message="404")
+        return SimpleNamespace(
+            success=True,
+            markdown=SimpleNamespace(raw_markdown=self.pages[url]),
+            response_headers={"ETag": f'"{hash(self.pages[url])}"'},
+        )
+
+
+class FakeCollection:
+    name = "websites"
+
+    def __init__(self):
+        self.upserts: List[List[str]] = []
+        self.deleted: List[str] = []
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.upserts.append(list(ids))
+
+    def delete(self, ids):
+        self.deleted.extend(ids)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    calls = {"in_flight": 0, "max_in_flight": 0, "embedding_batches": []}
+
+    async def tracked(result):
+        calls["in_flight"] += 1
+        calls["max_in_flight"] = max(calls["max_in_flight"], calls["in_flight"])
+        await asyncio.sleep(0.01)
+        calls["in_flight"] -= 1
+        return result
+
+    async def fake_title_and_summary(chunk, url):
+        return await tracked({"title": "T", "summary": "S"})
+
+    async def fake_context(page, chunk, url):
+        return await tracked("Context")
+
+    async def fake_embeddings(texts, model="text-embedding-3-small"):
+        calls["embedding_batches"].append(len(texts))
+        return [[0.1, 0.2] for _ in texts]
+
+    monkeypatch.setattr(crawler, "get_title_and_summary", fake_title_and_summary)
+    monkeypatch.setattr(crawler, "_generate_web_chunk_context", fake_context)
+    monkeypatch.setattr(crawler, "get_embeddings", fake_embeddings)
+    return calls
+
+
+def _page(paragraphs: int) -> str:
+    return "\n\n".join(f"Paragraph {i} " + "word " * 400 for i in range(paragraphs))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stores_every_chunk_in_batches(fake_llm):
+    pages = {f"https://docs.example.com/p{i}": _page(6) for i in range(5)}
+    expected_chunks = sum(len(crawler.chunk_text(text)) for text in pages.values())
+    collection = FakeCollection()
+    config = PipelineConfig(max_concurrent_enrichments=4, embedding_batch_size=8, batch_wait=0.05)
+
+    stats = await CrawlPipeline(FakeCrawler(pages), collection, config).run(
+        list(pages) + ["https://docs.example.com/missing"]
+    )
+
+    assert stats["pages_crawled"] == 5
+    assert stats["pages_failed"] == 1
+    assert stats["chunks_enriched"] == stats["chunks_embedded"] == stats["chunks_stored"] == expected_chunks
+    assert sum(len(ids) for ids in collection.upserts) == expected_chunks
+    # Embeddings are requested in batches, not one call per chunk
+    assert max(fake_llm["embedding_batches"]) > 1
+    assert all(size <= 8 for size in fake_llm["embedding_batches"])
+
+
+@pytest.mark.asyncio
+async def test_enrichment_runs_llm_calls_concurrently(fake_llm):
+    chunk = await crawler.enrich_chunk("Some chunk", 0, "https://example.com", "Some chunk")
+
+    assert chunk.content == "Context\n\nSome chunk"
+    assert chunk.embedding is None
+    assert fake_llm["max_in_flight"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_with_no_pages(fake_llm):
+    collection = FakeCollection()
+
+    stats = await CrawlPipeline(FakeCrawler({}), collection).run([])
+
+    assert stats["chunks_stored"] == 0
+    assert collection.upserts == []
+
+
+@pytest.fixture
+def state_store():
+    store = CrawlStateStore(":memory:")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def modified(monkeypatch):
+    """Every conditional GET reports the page as modified."""
+    async def fake_conditional_get(client, url, headers):
+        return False, {}
+
+    monkeypatch.setattr(crawler, "conditional_get", fake_conditional_get)
+
+
+@pytest.mark.asyncio
+async def test_recrawl_skips_unchanged_pages(fake_llm, state_store, modified):
+    pages = {"https://docs.example.com/a": _page(6), "https://docs.example.com/b": _page(3)}
+    collection = FakeCollection()
+    await CrawlPipeline(FakeCrawler(pages), collection, state_store=state_store).run(list(pages))
+    batches = len(fake_llm["embedding_batches"])
+
+    stats = await CrawlPipeline(FakeCrawler(pages), collection, state_store=state_store).run(list(pages))
+
+    assert stats["pages_unchanged"] == 2
+    assert stats["chunks_enriched"] == stats["chunks_stored"] == 0
+    assert len(fake_llm["embedding_batches"]) == batches
+
+
+@pytest.mark.asyncio
+async def test_recrawl_reprocesses_only_changed_chunks(fake_llm, state_store, modified):
+    url = "https://docs.example.com/a"
+    original = _page(6)
+    collection = FakeCollection()
+    await CrawlPipeline(FakeCrawler({url: original}), collection, state_store=state_store).run([url])
+    before = state_store.get_page(url)
+
+    chunks = crawler.chunk_text(original)
+    changed = original.replace("Paragraph 5 ", "Paragraph five ")
+    stats = await CrawlPipeline(FakeCrawler({url: changed}), collection, state_store=state_store).run([url])
+
+    assert stats["chunks_reused"] == len(chunks) - 1
+    assert stats["chunks_enriched"] == stats["chunks_stored"] == 1
+    after = state_store.get_page(url)
+    assert len(after.chunks) == len(chunks)
+    # The replaced chunk's old document is removed from the collection
+    assert collection.deleted == list(set(before.chunks.values()) - set(after.chunks.values()))
+
+
+@pytest.mark.asyncio
+async def test_not_modified_response_skips_the_browser(fake_llm, state_store, monkeypatch):
+    url = "https://docs.example.com/a"
+    fake_crawler = FakeCrawler({url: _page(2)})
+    await CrawlPipeline(fake_crawler, FakeCollection(), state_store=state_store).run([url])
+    sent = []
+
+    async def fake_conditional_get(client, url, headers):
+        sent.append(headers)
+        return True, {}
+
+    monkeypatch.setattr(crawler, "conditional_get", fake_conditional_get)
+    stats = await CrawlPipeline(fake_crawler, FakeCollection(), state_store=state_store).run([url])
+
+    assert stats["pages_unchanged"] == 1
+    assert fake_crawler.fetched == [url]
+    assert "If-None-Match" in sent[0]
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_leave_page_state_untouched(fake_llm, state_store, modified, monkeypatch):
+    url = "https://docs.example.com/a"
+
+    async def failing_embeddings(texts, model="text-embedding-3-small"):
+        return [None for _ in texts]
+
+    monkeypatch.setattr(crawler, "get_embeddings", failing_embeddings)
+    await CrawlPipeline(FakeCrawler({url: _page(2)}), FakeCollection(), state_store=state_store).run([url])
+
+    assert state_store.get_page(url) is None
+
+
+class FakeVectorClient:
+    collection_name = "websites"
+    user_id = "user-1"
+
+    def __init__(self):
+        self.calls = []
+        self.deleted = []
+
+    def upsert_embeddings(self, ids, documents, embeddings, metadatas, batch_size):
+        self.calls.append((list(ids), metadatas))
+        return list(ids)
+
+    def delete_documents(self, ids):
+        self.deleted.extend(ids)
+
+
+@pytest.mark.asyncio
+async def test_supabase_sink_writes_rag_metadata_in_batches(fake_llm):
+    pages = {f"https://docs.example.com/p{i}": _page(4) for i in range(3)}
+    expected_chunks = sum(len(crawler.chunk_text(text)) for text in pages.values())
+    client = FakeVectorClient()
+    sink = crawler.SupabaseCrawlSink(client)
+    config = PipelineConfig(store_batch_size=50, batch_wait=0.05)
+
+    stats = await CrawlPipeline(FakeCrawler(pages), sink, config).run(list(pages))
+
+    assert stats["chunks_stored"] == expected_chunks
+    assert len(client.calls) < expected_chunks
+    metadata = client.calls[0][1][0]
+    assert metadata["source"] in pages
+    assert metadata["original_content"].startswith("Paragraph")
+    assert {"title", "chunk_index", "has_context"} <= set(metadata)
+    assert sink.name == "supabase:websites:user-1"
+
+
+@pytest.mark.asyncio
+async def test_crawl_state_is_namespaced_by_sink(fake_llm, modified, tmp_path):
+    url = "https://docs.example.com/a"
+    path = str(tmp_path / "crawl_state.db")
+    chroma_state = CrawlStateStore(path, namespace="chroma:websites")
+    await CrawlPipeline(FakeCrawler({url: _page(2)}), FakeCollection(), state_store=chroma_state).run([url])
+    supabase_state = CrawlStateStore(path, namespace="supabase:websites:shared")
+
+    assert chroma_state.get_page(url) is not None
+    assert supabase_state.get_page(url) is None
+    chroma_state.close()
+    supabase_state.close()
@@ -0,0 +1,121 @@
+"""Tests for incremental daily log rollups."""
+from datetime import date
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.agents.planner import _get_yesterday_summary, insert_daily_log, remove_daily_log
+from src.storage.log_rollups import (
+    LogRollups,
+    apply_log_changes,
+    burndown,
+    clear_rollup_cache,
+    load_log_rollups,
+    summarize_rollups,
+)
+
+
+LOGS = {
+    "2024-05-06": [
+        {"log_id": "TASK-1", "description": "Drafted report", "actual_hours": 2},
+        {"log_id": "TASK-2", "description": "Client call", "actual_hours": 1.5},
+    ],
+    "2024-05-07": [{"log_id": "TASK-1", "description": "Edited report", "actual_hours": 3}],
+    "2024-05-13": [{"log_id": "TASK-2", "description": "Follow-up", "actual_hours": 1}],
+    "not-a-date": [{"log_id": "TASK-9", "description": "Ignored", "actual_hours": 5}],
+}
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_rollup_cache()
+    yield
+    clear_rollup_cache()
+
+
+def test_summaries_by_group():
+    rollups = LogRollups(LOGS)
+
+    assert rollups.summarize("task") == {"TASK-1": 5.0, "TASK-2": 2.5}
+    assert rollups.summarize("day", start=date(2024, 5, 7)) == {"2024-05-07": 3.0, "2024-05-13": 1.0}
+    assert rollups.summarize("week") == {"2024-W19": 6.5, "2024-W20": 1.0}
+    assert rollups.summarize("tag", task_tags={"TASK-1": ["writing", "work"]}) == {
+        "writing": 5.0, "work": 5.0, "untagged": 2.5
+    }
+
+
+def test_incremental_updates_match_rebuild():
+    rollups = LogRollups(LOGS)
+    added = {"log_id": "TASK-3", "description": "New", "actual_hours": 4}
+
+    rollups.add("2024-05-08", added)
+    rollups.remove("2024-05-13", LOGS["2024-05-13"][0])
+    rollups.update("2024-05-07", LOGS["2024-05-07"][0], dict(LOGS["2024-05-07"][0], actual_hours=1))
+
+    expected = {
+        "2024-05-06": LOGS["2024-05-06"],
+        "2024-05-07": [dict(LOGS["2024-05-07"][0], actual_hours=1)],
+        "2024-05-08": [added],
+    }
+    assert list(rollups.rows()) == list(LogRollups(expected).rows())
+    assert rollups.latest_date_before(date(2024, 5, 20)) == date(2024, 5, 8)
+
+
+def test_latest_date_before():
+    rollups = LogRollups(LOGS)
+
+    assert rollups.latest_date_before(date(2024, 5, 13)) == date(2024, 5, 7)
+    assert rollups.latest_date_before(date(2024, 5, 6)) is None
+
+
+def test_yesterday_summary_matches_with_rollups():
+    target = date(2024, 5, 10)
+
+    assert _get_yesterday_summary(LOGS, target, rollups=LogRollups(LOGS)) == _get_yesterday_summary(LOGS, target)
+
+
+def test_burndown():
+    rows = list(LogRollups(LOGS).rows())
+    report = burndown(rows, 6, date(2024, 5, 6), date(2024, 5, 8), task_keys=["TASK-1"])
+
+    assert report == [
+        {"date": "2024-05-06", "logged": 2.0, "remaining": 4.0},
+        {"date": "2024-05-07", "logged": 3.0, "remaining": 1.0},
+        {"date": "2024-05-08", "logged": 0.0, "remaining": 1.0},
+    ]
+
+
+def test_summarize_rejects_unknown_group():
+    with pytest.raises(ValueError):
+        summarize_rollups([], "month")
+
+
+def test_cached_rollups_follow_planner_writes(tmp_path: Path):
+    logs_file = tmp_path / "daily_logs.yaml"
+    logs_file.write_text(yaml.safe_dump({"2024-05-06": LOGS["2024-05-06"]}))
+    paths = {"logs": str(logs_file)}
+
+    rollups = load_log_rollups(str(logs_file))
+    insert_daily_log("Reviewed PR on 2024-05-07", "TASK-5", 2, paths=paths)
+
+    assert load_log_rollups(str(logs_file)) is rollups
+    assert rollups.summarize("task") == {"TASK-1": 2.0, "TASK-2": 1.5, "TASK-5": 2.0}
+
+    remove_daily_log("2024-05-06", task_id="TASK-2", paths=paths)
+    assert rollups.summarize("task") == {"TASK-1": 2.0, "TASK-5": 2.0}
+    assert rollups.logs == yaml.safe_load(logs_file.read_text())
+
+
+def test_apply_log_changes_rebuilds_when_out_of_sync(tmp_path: Path):
+    logs_file = tmp_path / "daily_logs.yaml"
+    logs_file.write_text(yaml.safe_dump({"2024-05-06": LOGS["2024-05-06"]}))
+    rollups = load_log_rollups(str(logs_file))
+
+    # Written elsewhere: two new entries, but only one reported
+    logs = {"2024-05-06": LOGS["2024-05-06"], "2024-05-07": LOGS["2024-05-07"] * 2}
+    logs_file.write_text(yaml.safe_dump(logs))
+    apply_log_changes(str(logs_file), logs, added=[("2024-05-07", LOGS["2024-05-07"][0])])
+
+    assert rollups.summarize("task") == {"TASK-1": 8.0, "TASK-2": 1.5}
+    assert load_log_rollups(str(logs_file)) is rollups
@@ -0,0 +1,111 @@
+"""Tests for the rule-based planner fast path."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from datetime import date, timedelta
+
+from src.agents.planner_fastpath import (
+    FAST_PATH_CONFIDENCE_THRESHOLD,
+    FAST_PATH_STATS,
+    get_fast_path_stats,
+    match_command,
+)
+from src.agents.planner_parser import PlannerParser
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    FAST_PATH_STATS.reset()
+    yield
+    FAST_PATH_STATS.reset()
+
+
+@pytest.fixture
+def parser():
+    from pydantic_ai.models.test import TestModel
+    parser = PlannerParser(TestModel())
+    parser.agent.run = AsyncMock(return_value=Mock(
+        data='{"action": "list_tasks", "data": {}}'
+    ))
+    return parser
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("spent 3 hours on TASK-12",
+     {"action": "add_log", "data": {"log_id": "TASK-12", "hours": 3}}),
+    ("log 2.5h on task-3 fixing login",
+     {"action": "add_log", "data": {"log_id": "TASK-3", "description": "fixing login", "hours": 2.5}}),
+    ("mark TASK-4 done",
+     {"action": "update_task", "data": {"identifier": "TASK-4", "updates": {"status": "completed"}}}),
+    ("set task TASK-4 to in progress",
+     {"action": "update_task", "data": {"identifier": "TASK-4", "updates": {"status": "in_progress"}}}),
+    ("update TASK-1 priority to high",
+     {"action": "update_task", "data": {"identifier": "TASK-1", "updates": {"priority": "high"}}}),
+    ("remove task TASK-1", {"action": "remove_task", "data": {"identifier": "TASK-1"}}),
+    ("add task 'research and development' with high priority",
+     {"action": "add_task", "data": {"title": "research and development", "priority": "high"}}),
+    ("list all tasks", {"action": "list_tasks", "data": {}}),
+    ("plan for tomorrow", {"action": "plan_day", "data": {"date": "tomorrow"}}),
+    ("do I have meetings tomorrow?", {"action": "list_meetings", "data": {"date": "tomorrow"}}),
+    ("brainstorm task 111025", {"action": "brainstorm_task", "data": {"task_id": "111025"}}),
+])
+def test_match_common_commands(query, expected):
+    match = match_command(query)
+
+    assert match is not None
+    assert match.command == expected
+    assert match.confidence >= FAST_PATH_CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize("query", [
+    "change status of job search to in progress",
+    "schedule meeting team sync tomorrow at 10am",
+    "mark TASK-1 done and remove TASK-2",
+    "add task 'job search' with tag 'personal' and high priority",
+])
+def test_unrecognized_commands_are_not_matched(query):
+    match = match_command(query)
+
+    assert match is None or match.confidence < FAST_PATH_CONFIDENCE_THRESHOLD
+
+
+def test_free_text_rule_with_second_intent_is_low_confidence():
+    match = match_command("spent 3 hours on TASK-1 and mark it done")
+
+    assert match is not None
+    assert match.confidence < FAST_PATH_CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.asyncio
+async def test_parser_skips_llm_on_fast_path(parser):
+    result = await parser.parse("log 2 hours on TASK-1 yesterday")
+
+    parser.agent.run.assert_not_called()
+    assert result["action"] == "add_log"
+    assert result["data"]["date"] == (date.today() - timedelta(days=1)).isoformat()
+
+    stats = get_fast_path_stats()
+    assert stats["fast_path"] == 1
+    assert stats["rule_hits"] == {"log_hours": 1}
+
+
+@pytest.mark.asyncio
+async def test_parser_falls_back_to_llm(parser):
+    await parser.parse("what should I work on next?")
+    await parser.parse("spent 3 hours on TASK-1 and mark it done")
+
+    assert parser.agent.run.call_count == 2
+    stats = get_fast_path_stats()
+    assert stats["total"] == 2
+    assert stats["llm_fallback"] == 2
+    assert stats["low_confidence"] == 1
+    assert stats["coverage"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_fast_path_can_be_disabled(parser):
+    parser.fast_path = False
+
+    await parser.parse("list all tasks")
+
+    parser.agent.run.assert_called_once()
@@ -313,6 +313,50 @@ def test_create_task_and_log(mock_save, mock_load, planner_ops):
     assert mock_save.call_count == 2
 
 
+@patch('src.agents.planner_ops.load_yaml')
+@patch('src.agents.planner_ops.save_yaml')
+def test_apply_batch_saves_each_file_once(mock_save, mock_load, planner_ops, sample_tasks):
+    """Test that a batch loads and saves each touched file only once."""
+    mock_load.side_effect = [sample_tasks, {}]
+    
+    result = planner_ops.apply_batch([
+        {"action": "add_task", "data": {"title": "Write report", "priority": "high"}},
+        {"action": "add_log", "data": {"task_title": "Write report", "description": "Drafted intro", "hours": 2}},
+        {"action": "update_task", "data": {"identifier": "TASK-1", "updates": {"status": "completed"}}},
+        {"action": "remove_task", "data": {"identifier": "TASK-2"}},
+    ])
+    
+    assert result["success"] is True
+    assert len(result["results"]) == 4
+    assert mock_load.call_count == 2
+    assert mock_save.call_count == 2
+    
+    saved = {call.args[0]: call.args[1] for call in mock_save.call_args_list}
+    tasks = saved[planner_ops.paths['tasks']]
+    assert [t["id"] for t in tasks] == ["TASK-1", "TASK-3"]
+    assert tasks[0]["status"] == "completed"
+    
+    logs = saved[planner_ops.paths['logs']]
+    (entries,) = logs.values()
+    assert entries == [{"log_id": "TASK-3", "description": "Drafted intro", "actual_hours": 2}]
+
+
+@patch('src.agents.planner_ops.load_yaml')
+@patch('src.agents.planner_ops.save_yaml')
+def test_apply_batch_is_all_or_nothing(mock_save, mock_load, planner_ops, sample_tasks):
+    """Test that a failing operation leaves every file untouched."""
+    mock_load.return_value = sample_tasks
+    
+    result = planner_ops.apply_batch([
+        {"action": "add_task", "data": {"title": "Write report"}},
+        {"action": "remove_task", "data": {"identifier": "NONEXISTENT"}},
+    ])
+    
+    assert result["success"] is False
+    assert result["error"].startswith("Operation 2 (remove_task) failed")
+    mock_save.assert_not_called()
+
+
 @patch('src.agents.planner_ops.os.path.exists')
 def test_load_yaml_file_not_found(mock_exists, planner_ops):
     """Test loading non-existent YAML file."""
@@ -107,6 +107,48 @@ async def test_parse_missing_fields(parser):
     assert "Invalid response" in result["data"]["message"]
 
 
+@pytest.mark.asyncio
+async def test_parse_batch(parser):
+    """Test parsing a request with several write intents."""
+    parser.agent.run = AsyncMock(return_value=Mock(
+        data=json.dumps({"action": "batch", "data": {"operations": [
+            {"action": "add_task", "data": {"title": "write report", "due_date": "tomorrow"}},
+            {"action": "add_log", "data": {"task_title": "write report", "description": "write report", "hours": 2}},
+            {"action": "update_task", "data": {"identifier": "TASK-1", "updates": {"status": "completed"}}},
+        ]}})
+    ))
+    
+    operations = await parser.parse_batch("add task 'write report' due tomorrow, log 2 hours on it and mark TASK-1 as completed")
+    
+    assert [op["action"] for op in operations] == ["add_task", "add_log", "update_task"]
+    # Dates are processed per operation
+    assert operations[0]["data"]["due_date"] == (date.today() + timedelta(days=1)).isoformat()
+
+
+@pytest.mark.asyncio
+async def test_parse_batch_single_intent(parser):
+    """Test that a single command is returned as a one-element batch."""
+    parser.agent.run = AsyncMock(return_value=Mock(
+        data='{"action": "remove_task", "data": {"identifier": "TASK-1"}}'
+    ))
+    
+    operations = await parser.parse_batch("remove task TASK-1")
+    
+    assert operations == [{"action": "remove_task", "data": {"identifier": "TASK-1"}}]
+
+
+@pytest.mark.asyncio
+async def test_parse_batch_rejects_read_actions(parser):
+    """Test that only write actions are accepted inside a batch."""
+    parser.agent.run = AsyncMock(return_value=Mock(
+        data='{"action": "batch", "data": {"operations": [{"action": "plan_day", "data": {}}]}}'
+    ))
+    
+    result = await parser.parse("plan my day and list tasks")
+    
+    assert result["action"] == "error"
+
+
 def test_parse_date_today(parser):
     """Test date parsing for 'today'."""
     result = parser._parse_date("today")
@@ -0,0 +1,135 @@
+"""Tests for the streaming sitemap reader and URL frontier."""
+import asyncio
+import gzip
+
+import httpx
+import pytest
+
+from src.processors.sitemap import URLFrontier, feed_frontier_from_sitemap, iter_sitemap
+
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://docs.example.com/pages.xml</loc></sitemap>
+  <sitemap><loc>https://docs.example.com/blog.xml.gz</loc></sitemap>
+  <sitemap><loc>https://docs.example.com/sitemap.xml</loc></sitemap>
+</sitemapindex>"""
+
+PAGES = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://docs.example.com/a</loc><lastmod>2024-01-01</lastmod></url>
+  <url><loc>https://docs.example.com/b</loc><priority>0.9</priority></url>
+</urlset>"""
+
+BLOG = gzip.compress(b"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://docs.example.com/blog/1</loc><lastmod>2024-03-01T10:00:00Z</lastmod></url>
+  <url><loc>https://docs.example.com/a</loc></url>
+</urlset>""")
+
+
+def _client(requested=None):
+    documents = {
+        "/sitemap.xml": INDEX,
+        "/pages.xml": PAGES,
+        "/blog.xml.gz": BLOG,
+    }
+
+    def handler(request):
+        if requested is not None:
+            requested.append(request.url.path)
+        body = documents.get(request.url.path)
+        if body is None:
+            return httpx.Response(404)
+
+        async def stream():
+            # Small chunks force the parser to work incrementally
+            for i in range(0, len(body), 16):
+                yield body[i:i + 16]
+
+        return httpx.Response(200, content=stream())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_iter_sitemap_follows_index_and_gzip():
+    requested = []
+    async with _client(requested) as client:
+        entries = [entry async for entry in iter_sitemap("https://docs.example.com/sitemap.xml", client)]
+
+    assert [entry.url for entry in entries] == [
+        "https://docs.example.com/a",
+        "https://docs.example.com/b",
+        "https://docs.example.com/blog/1",
+        "https://docs.example.com/a",
+    ]
+    assert entries[1].priority == 0.9
+    assert entries[2].lastmod == "2024-03-01T10:00:00Z"
+    # The index listing itself is not fetched twice
+    assert requested.count("/sitemap.xml") == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_sitemap_survives_missing_and_invalid_sitemaps():
+    async with _client() as client:
+        entries = [entry async for entry in iter_sitemap("https://docs.example.com/missing.xml", client)]
+
+    assert entries == []
+
+
+@pytest.mark.asyncio
+async def test_frontier_orders_by_priority_then_lastmod_and_dedupes():
+    frontier = URLFrontier(max_per_domain=10)
+    async with _client() as client:
+        added = await feed_frontier_from_sitemap("https://docs.example.com/sitemap.xml", frontier, client)
+    frontier.close()
+
+    urls = []
+    while (url := await frontier.get()) is not None:
+        urls.append(url)
+        frontier.done(url)
+
+    assert added == 3
+    assert urls == [
+        "https://docs.example.com/b",
+        "https://docs.example.com/blog/1",
+        "https://docs.example.com/a",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_frontier_limits_concurrent_requests_per_domain():
+    frontier = URLFrontier(max_per_domain=1)
+    for path in ("a", "b"):
+        frontier.add(f"https://one.example.com/{path}")
+    frontier.add("https://two.example.com/a")
+    frontier.add("https://one.example.com/a#section")
+    frontier.close()
+
+    first = await frontier.get()
+    second = await frontier.get()
+    assert {first, second} == {"https://one.example.com/a", "https://two.example.com/a"}
+
+    # one.example.com is busy until its first URL is done
+    third = asyncio.create_task(frontier.get())
+    await asyncio.sleep(0.01)
+    assert not third.done()
+    frontier.done("https://one.example.com/a")
+    assert await third == "https://one.example.com/b"
+
+    frontier.done("https://one.example.com/b")
+    frontier.done("https://two.example.com/a")
+    assert await frontier.get() is None
+
+
+@pytest.mark.asyncio
+async def test_frontier_waits_for_producer_until_closed():
+    frontier = URLFrontier()
+    waiting = asyncio.create_task(frontier.get())
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+
+    frontier.add("https://docs.example.com/a")
+    assert await waiting == "https://docs.example.com/a"
+    frontier.close()
+    assert await frontier.get() is None
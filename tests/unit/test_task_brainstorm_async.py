@@ -148,23 +148,18 @@ class TestGenerateBrainstormContentAsync:
 class TestBrainstormManagerAsync:
     """Test async BrainstormManager methods."""
     
-    def setup_method(self):
-        """Set up test data."""
-        self.temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False)
-        self.temp_file.close()
-        self.brainstorm_file = self.temp_file.name
+    @pytest.fixture(autouse=True)
+    def setup_manager(self, tmp_path):
+        """Set up test data; generated files go to tmp_path, not data/."""
+        self.brainstorm_file = str(tmp_path / "task_brainstorms.md")
         
         self.manager = BrainstormManager(
             brainstorm_file=self.brainstorm_file,
             tasks_file='dummy_tasks.yaml',
-            task_details_file='dummy_details.yaml'
+            task_details_file='dummy_details.yaml',
+            data_dir=str(tmp_path)
         )
     
-    def teardown_method(self):
-        """Clean up test data."""
-        if os.path.exists(self.brainstorm_file):
-            os.unlink(self.brainstorm_file)
-    
     @pytest.mark.asyncio
     @patch('src.agents.task_brainstorm.find_task_by_query')
     @patch('src.agents.task_brainstorm.load_existing_brainstorm')
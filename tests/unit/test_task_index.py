@@ -0,0 +1,98 @@
+"""Tests for the local task embedding index."""
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.agents.task_index import TaskEmbeddingIndex, task_embedding_text
+
+
+VOCAB = ["report", "email", "deploy", "review", "invoice"]
+
+
+class FakeEmbedder:
+    """Bag-of-words embedder that records how many texts it embedded."""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    async def __call__(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(text.lower().count(word)) + 0.01 for word in VOCAB] for text in texts]
+
+    @property
+    def embedded(self) -> int:
+        return sum(len(call) for call in self.calls)
+
+
+TASKS = [
+    {"id": "TASK-1", "title": "Write quarterly report", "status": "pending", "priority": "high"},
+    {"id": "TASK-2", "title": "Answer client email", "status": "pending", "priority": "medium"},
+    {"id": "TASK-3", "title": "Deploy review app", "status": "pending", "priority": "low",
+     "tags": ["deploy"]},
+]
+
+
+@pytest.mark.asyncio
+async def test_search_returns_nearest_tasks():
+    embedder = FakeEmbedder()
+    index = TaskEmbeddingIndex(index_path=None, embed_fn=embedder)
+
+    await index.sync(TASKS)
+    results = await index.search("deploy", top_k=2)
+
+    assert results[0][0] == 2
+    assert len(results) == 2
+    assert results[0][1] >= results[1][1]
+
+
+@pytest.mark.asyncio
+async def test_sync_only_embeds_changed_tasks():
+    embedder = FakeEmbedder()
+    index = TaskEmbeddingIndex(index_path=None, embed_fn=embedder)
+
+    assert await index.sync(TASKS, version=1) == 3
+    assert await index.sync(TASKS, version=1) == 0
+
+    edited = [dict(t) for t in TASKS]
+    edited[1]["title"] = "Send invoice email"
+    edited.append({"id": "TASK-4", "title": "Review invoice"})
+
+    assert await index.sync(edited, version=2) == 2
+    assert embedder.embedded == 5
+    assert len(index) == 4
+
+
+@pytest.mark.asyncio
+async def test_query_embeddings_are_cached():
+    embedder = FakeEmbedder()
+    index = TaskEmbeddingIndex(index_path=None, embed_fn=embedder)
+    await index.sync(TASKS)
+
+    await index.search("report")
+    await index.search("report")
+
+    assert embedder.embedded == len(TASKS) + 1
+
+
+@pytest.mark.asyncio
+async def test_index_persists_across_instances(tmp_path: Path):
+    path = str(tmp_path / "task_embeddings.npz")
+    first = FakeEmbedder()
+    await TaskEmbeddingIndex(index_path=path, embed_fn=first).sync(TASKS)
+
+    second = FakeEmbedder()
+    index = TaskEmbeddingIndex(index_path=path, embed_fn=second)
+    assert await index.sync(TASKS) == 0
+    assert second.embedded == 0
+
+    results = await index.search("email", top_k=1)
+    assert results[0][0] == 1
+
+
+def test_task_embedding_text_includes_metadata():
+    text = task_embedding_text(TASKS[2])
+
+    assert "Deploy review app" in text
+    assert "tags: deploy" in text
+    assert "priority: low" in text
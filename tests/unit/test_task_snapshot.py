@@ -0,0 +1,97 @@
+"""Tests for the columnar task snapshot."""
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.agents.planner import _score_task
+from src.agents.task_snapshot import (
+    TaskSnapshot,
+    load_task_snapshot,
+    clear_snapshot_cache,
+)
+
+
+TASKS = [
+    {"id": "TASK-1", "title": "Finish report", "priority": "high", "due_date": "2024-05-02",
+     "status": "pending", "tags": ["writing"]},
+    {"id": "TASK-2", "title": "Email client", "priority": "medium", "due_date": "2024-05-10",
+     "status": "in_progress", "tags": []},
+    {"id": "TASK-3", "title": "Old cleanup", "priority": "low", "status": "completed", "tags": ["chore"]},
+    {"id": "TASK-4", "title": "No due date", "priority": "urgent", "status": "Pending"},
+    {"id": "TASK-5", "title": "Review PR", "priority": "medium", "due_date": "bad-date",
+     "status": "pending", "description": "Review the Jira import PR", "tags": ["code", "review"]},
+    {"id": "TASK-6", "title": "Tie with task 2", "priority": "medium", "due_date": "2024-05-10",
+     "status": "pending"},
+]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_snapshot_cache()
+    yield
+    clear_snapshot_cache()
+
+
+def test_scores_match_score_task():
+    target = date(2024, 5, 1)
+    snapshot = TaskSnapshot(TASKS)
+
+    assert list(snapshot.scores(target)) == [_score_task(t, target) for t in TASKS]
+
+
+def test_ranked_pending_matches_python_sort():
+    target = date(2024, 5, 1)
+    snapshot = TaskSnapshot(TASKS)
+
+    completion = {"done", "completed", "finished", "complete", "cancelled", "canceled"}
+    expected = [t for t in TASKS if t.get("status", "").lower() not in completion]
+    expected.sort(key=lambda t: _score_task(t, target), reverse=True)
+
+    assert snapshot.ranked_pending(target) == expected
+
+
+def test_keyword_matches_per_field():
+    snapshot = TaskSnapshot(TASKS)
+
+    masks = snapshot.keyword_matches("review")
+    assert list(masks["title"]) == [False, False, False, False, True, False]
+    assert list(masks["description"]) == [False, False, False, False, True, False]
+    assert list(masks["tags"]) == [False, False, False, False, True, False]
+
+    masks = snapshot.keyword_matches("TASK-1")
+    assert list(masks["id"]) == [True, False, False, False, False, False]
+
+    # Tags are matched one at a time, never across a tag boundary
+    assert not snapshot.keyword_matches("codereview")["tags"].any()
+
+
+def test_empty_snapshot():
+    snapshot = TaskSnapshot([])
+
+    assert snapshot.ranked_pending(date(2024, 5, 1)) == []
+    assert not snapshot.keyword_matches("anything")["title"].any()
+
+
+def test_load_task_snapshot_reuses_unchanged_file(tmp_path: Path):
+    tasks_file = tmp_path / "tasks.yaml"
+    tasks_file.write_text("- id: T1\n  title: First\n  status: pending\n")
+
+    first = load_task_snapshot(str(tasks_file))
+    assert load_task_snapshot(str(tasks_file)) is first
+
+    tasks_file.write_text("- id: T1\n  title: First\n  status: pending\n- id: T2\n  title: Second\n")
+    second = load_task_snapshot(str(tasks_file))
+    assert second is not first
+    assert [t["id"] for t in second.tasks] == ["T1", "T2"]
+
+
+def test_load_task_snapshot_rejects_non_list(tmp_path: Path):
+    tasks_file = tmp_path / "tasks.yaml"
+    tasks_file.write_text("not: a list\n")
+
+    with pytest.raises(ValueError):
+        load_task_snapshot(str(tasks_file))
+
+    with pytest.raises(FileNotFoundError):
+        load_task_snapshot(str(tmp_path / "missing.yaml"))